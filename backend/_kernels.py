@@ -0,0 +1,206 @@
+"""
+Game KPI Projection - Numeric Kernels
+=====================================
+프로젝션 1회당 (시나리오 × 일수) 만큼 호출되는 순수 수치 헬퍼 모음
+
+main.py와 분리해 두어 빌드 단계에서 mypyc로 C 확장 모듈로 AOT 컴파일할 수 있습니다.
+(render_build.sh 참고, 컴파일 실패 시 순수 Python 모듈로 그대로 동작)
+"""
+
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Sequence, Tuple, Union
+import random
+
+import numpy as np
+import pandas as pd  # type: ignore[import-untyped]
+
+# ============================================
+# 글로벌 계절성 팩터 (지역별 월간 가중치)
+# ============================================
+SEASONALITY_BY_REGION: Dict[str, Dict[int, float]] = {
+    "korea": {1: 1.15, 2: 1.20, 3: 1.00, 4: 0.95, 5: 1.00, 6: 0.95, 7: 1.05, 8: 1.10, 9: 1.00, 10: 1.05, 11: 1.10, 12: 1.15},
+    "japan": {1: 1.10, 2: 1.05, 3: 1.05, 4: 1.10, 5: 1.15, 6: 0.95, 7: 1.00, 8: 1.05, 9: 1.00, 10: 1.00, 11: 1.05, 12: 1.20},
+    "china": {1: 1.10, 2: 1.25, 3: 1.00, 4: 0.95, 5: 1.05, 6: 1.10, 7: 1.05, 8: 1.00, 9: 1.00, 10: 1.20, 11: 1.15, 12: 1.05},
+    "global": {1: 0.95, 2: 0.90, 3: 0.95, 4: 1.00, 5: 1.00, 6: 1.00, 7: 1.05, 8: 1.00, 9: 1.00, 10: 1.05, 11: 1.15, 12: 1.25},
+    "sea": {1: 1.05, 2: 1.10, 3: 1.00, 4: 1.00, 5: 1.00, 6: 1.05, 7: 1.05, 8: 1.00, 9: 1.00, 10: 1.00, 11: 1.05, 12: 1.15},
+    "na": {1: 0.90, 2: 0.90, 3: 0.95, 4: 1.00, 5: 1.00, 6: 1.05, 7: 1.05, 8: 1.00, 9: 0.95, 10: 1.05, 11: 1.20, 12: 1.25},
+    "sa": {1: 1.10, 2: 1.05, 3: 1.00, 4: 0.95, 5: 0.95, 6: 1.00, 7: 1.05, 8: 1.00, 9: 1.00, 10: 1.05, 11: 1.10, 12: 1.15},
+    "eu": {1: 0.90, 2: 0.90, 3: 0.95, 4: 1.05, 5: 1.00, 6: 1.00, 7: 1.00, 8: 0.95, 9: 1.00, 10: 1.05, 11: 1.15, 12: 1.25},
+}
+
+# 월 인덱스(0=1월)로 바로 조회할 수 있도록 지역별 12개월 배열을 미리 생성
+SEASONALITY_ARR: Dict[str, np.ndarray] = {
+    region: np.array([monthly[m] for m in range(1, 13)], dtype=np.float32)
+    for region, monthly in SEASONALITY_BY_REGION.items()
+}
+
+@lru_cache(maxsize=64)
+def _region_monthly(regions_fs: FrozenSet[str]) -> np.ndarray:
+    """지역 조합별 월간 평균 계절성 (12개월, 매칭 지역이 없으면 1.0)"""
+    arrays = [SEASONALITY_ARR[r] for r in regions_fs if r in SEASONALITY_ARR]
+    if not arrays:
+        return np.ones(12, dtype=np.float32)
+    return np.mean(arrays, axis=0)
+
+def calculate_seasonality(regions: List[str], launch_date: str, days: int = 365) -> List[float]:
+    """
+    지역별 계절성 팩터 계산
+    - 월간 기본 계절성
+    - 주간 변동성 (주말 +15~20%)
+    - 특별 이벤트 스파이크 (명절, 대형 업데이트 등)
+    """
+    # 날짜 축을 C 레벨에서 한 번에 생성 (일별 timedelta/datetime 객체 할당 없음)
+    try:
+        dates = pd.date_range(start=launch_date, periods=days, freq="D")
+    except (ValueError, TypeError):
+        dates = pd.date_range(start="2026-11-12", periods=days, freq="D")  # 기본값
+    months = dates.month.to_numpy()
+    weekdays = dates.weekday.tolist()  # 0=월, 6=일
+    month_days = list(zip(months.tolist(), dates.day.tolist()))
+    
+    # 시드 고정 (재현성) - 전역 random 상태 대신 호출마다 독립된 난수 생성기 사용
+    # (threadpool에서 동시에 호출돼도 난수 순서가 섞이지 않고, 다른 모듈의 random 상태도 건드리지 않음)
+    rng = random.Random(42)
+    
+    # 특별 이벤트 날짜 (월-일 기준)
+    SPECIAL_EVENTS: Dict[str, List[tuple]] = {
+        "korea": [(1, 1), (2, 1), (2, 2), (5, 5), (9, 15), (9, 16), (9, 17), (12, 25), (12, 31)],  # 설날, 추석, 크리스마스 등
+        "japan": [(1, 1), (5, 3), (5, 4), (5, 5), (8, 15), (12, 25), (12, 31)],  # 신정, 골든위크, 오본 등
+        "global": [(1, 1), (11, 24), (11, 25), (12, 24), (12, 25), (12, 31)],  # 블랙프라이데이, 크리스마스 등
+        "na": [(1, 1), (7, 4), (11, 24), (11, 25), (12, 24), (12, 25), (12, 31)],
+        "eu": [(1, 1), (12, 24), (12, 25), (12, 31)],
+        "china": [(1, 1), (2, 1), (2, 2), (10, 1), (10, 2), (10, 3)],  # 춘절, 국경절
+        "sea": [(1, 1), (4, 13), (4, 14), (11, 1), (12, 25), (12, 31)],  # 송끄란 등
+        "sa": [(1, 1), (2, 13), (2, 14), (12, 25), (12, 31)],  # 카니발 등
+    }
+    
+    # 지역 조합의 월간 평균 계절성 (캐시됨)
+    avg_month = _region_monthly(frozenset(region.lower() for region in regions))
+    # 1. 월간 기본 계절성 (월 인덱스로 한 번에 gather)
+    base_factors = avg_month[months - 1].tolist()
+    
+    factors: List[float] = []
+    for day in range(days):
+        base_factor = base_factors[day]
+        weekday = weekdays[day]
+        month_day = month_days[day]
+        
+        # 2. 주간 변동성 (금~일 +15~20%, 월~화 -5~10%)
+        if weekday == 4:  # 금요일
+            weekly_factor = 1.12 + rng.uniform(0, 0.05)
+        elif weekday == 5:  # 토요일
+            weekly_factor = 1.18 + rng.uniform(0, 0.07)
+        elif weekday == 6:  # 일요일
+            weekly_factor = 1.15 + rng.uniform(0, 0.05)
+        elif weekday in [0, 1]:  # 월/화
+            weekly_factor = 0.92 + rng.uniform(0, 0.05)
+        else:  # 수/목
+            weekly_factor = 1.0 + rng.uniform(-0.02, 0.02)
+        
+        # 3. 특별 이벤트 스파이크 (+30~60%)
+        event_factor = 1.0
+        for region in regions:
+            region_key = region.lower()
+            if region_key in SPECIAL_EVENTS:
+                if month_day in SPECIAL_EVENTS[region_key]:
+                    event_factor = max(event_factor, 1.35 + rng.uniform(0, 0.25))
+        
+        # 4. 대형 업데이트 시뮬레이션 (30일마다 +20~35%)
+        if day > 30 and (day % 30 < 3 or day % 30 > 27):
+            event_factor = max(event_factor, 1.20 + rng.uniform(0, 0.15))
+        
+        # 5. 약간의 랜덤 노이즈 (±3%)
+        noise = 1.0 + rng.uniform(-0.03, 0.03)
+        
+        final_factor = base_factor * weekly_factor * event_factor * noise
+        factors.append(final_factor)
+    
+    return factors
+
+@lru_cache(maxsize=128)
+def seasonality_array(regions: Tuple[str, ...], launch_date: str, days: int) -> np.ndarray:
+    """
+    calculate_seasonality 결과를 (지역, 런칭일, 기간) 단위로 캐시한 읽기 전용 float64 배열
+    
+    지역 순서에 따라 난수 소비 순서가 달라지므로 키는 정렬하지 않고 입력 순서 그대로 사용
+    """
+    factors = np.asarray(calculate_seasonality(list(regions), launch_date, days), dtype=np.float64)
+    factors.setflags(write=False)  # 캐시 공유 배열이 제자리 연산으로 오염되지 않도록
+    return factors
+
+# ============================================
+# Time-Decay 블렌딩 (시간에 따라 가중치 변경)
+# ============================================
+def time_decay_weights(days: int = 365) -> np.ndarray:
+    """
+    일별 내부 가중치 계산 (Time-Decay)
+    
+    D1: 내부 90% : 벤치마크 10%
+    D180: 내부 50% : 벤치마크 50%
+    D365: 내부 10% : 벤치마크 90%
+    
+    선형 보간으로 매일 가중치 변경 (길이 days 배열, 벤치마크 가중치는 1 - 내부 가중치)
+    """
+    if days <= 1:
+        return np.full(days, 0.9)
+    # D1 = 0.9, D365 = 0.1 (선형 감소)
+    day = np.arange(1, days + 1, dtype=np.float64)
+    return np.clip(0.9 - (0.8 * (day - 1) / (days - 1)), 0.1, 0.9)
+
+def pad_to(values: Union[np.ndarray, Sequence[float]], n: int) -> np.ndarray:
+    """길이 n의 float64 ndarray로 변환 (짧으면 마지막 값으로 채우고, 길면 자름)"""
+    arr = np.asarray(values, dtype=np.float64)[:n]
+    if arr.shape[0] < n:
+        arr = np.pad(arr, (0, n - arr.shape[0]), mode="edge")
+    return arr
+
+def calculate_time_decay_blended_retention(
+    internal_curve: np.ndarray,
+    benchmark_curve: np.ndarray,
+    days: int = 365,
+    quality_score: float = 1.0
+) -> np.ndarray:
+    """
+    Time-Decay 블렌딩 리텐션 커브 생성
+    
+    Args:
+        internal_curve: 내부 표본 리텐션 커브
+        benchmark_curve: 벤치마크 리텐션 커브
+        days: 프로젝션 기간
+        quality_score: 품질 점수 (S=1.2, A=1.1, B=1.0, C=0.9, D=0.8)
+    """
+    weight_internal = time_decay_weights(days)
+    weight_benchmark = 1 - weight_internal
+    
+    internal_vals = pad_to(internal_curve, days)
+    benchmark_vals = pad_to(benchmark_curve, days)
+    
+    # 벤치마크에 품질 점수 적용
+    adjusted_benchmark = benchmark_vals * quality_score
+    
+    blended = (internal_vals * weight_internal) + (adjusted_benchmark * weight_benchmark)
+    return np.clip(blended, 0.001, 1.0)
+
+# ============================================
+# V8.5: UA/Brand 분리 NRU 계산 (Organic Boost)
+# ============================================
+def calculate_organic_boost(brand_budget: int, ua_budget: int) -> float:
+    """
+    브랜딩 예산에 따른 Organic Ratio 증폭 계수 계산
+    
+    로직:
+    - brand_budget이 ua_budget의 0%일 때: 1.0배 (증폭 없음)
+    - brand_budget이 ua_budget의 50%일 때: 1.5배
+    - brand_budget이 ua_budget의 100%일 때: 2.0배
+    - brand_budget이 ua_budget의 200%일 때: 2.5배 (수확체감)
+    
+    Logarithmic 함수를 사용해 수확체감 효과 적용
+    """
+    if ua_budget <= 0:
+        return 1.0
+    
+    ratio = brand_budget / ua_budget
+    # Logarithmic boost: 1 + ln(1 + ratio) * 0.7
+    # ratio=0.5 → 1.28배, ratio=1.0 → 1.49배, ratio=2.0 → 1.77배
+    boost = 1.0 + np.log(1 + ratio) * 0.7
+    return min(float(boost), 3.0)  # 최대 3배로 캡
@@ -1,15 +1,58 @@
 from fastapi import FastAPI, UploadFile, File, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from fastapi.concurrency import run_in_threadpool
 from starlette.middleware import Middleware
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator
 from typing import List, Dict, Optional, Any
+from functools import lru_cache
+from contextlib import asynccontextmanager
+from pathlib import Path
 import numpy as np
 from scipy.optimize import curve_fit
+from scipy.signal import fftconvolve
+import asyncio
+import hashlib
 import json
 import os
+import random
+import tempfile
+import time
 import httpx
+import orjson
+
+# 수치 커널 (빌드 시 mypyc로 컴파일되면 C 확장 모듈이 자동으로 import 됨)
+from _kernels import (
+    seasonality_array,
+    calculate_time_decay_blended_retention,
+    calculate_organic_boost,
+    pad_to,
+)
+
+class ORJSONResponse(JSONResponse):
+    """orjson 기반 JSON 응답 (numpy 배열/스칼라를 C 레벨에서 바로 직렬화)
 
-app = FastAPI(title="Game KPI Projection API", version="2.0.0")
+    FastAPI 내장 ORJSONResponse는 최신 버전에서 deprecated 되어 직접 정의해 사용합니다.
+    """
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """앱 수명 동안 AI 호출용 httpx 클라이언트 하나를 공유 (요청마다 TCP/TLS 핸드셰이크 반복 방지)"""
+    app.state.http = httpx.AsyncClient(
+        timeout=AI_REQUEST_TIMEOUT,
+        limits=httpx.Limits(max_keepalive_connections=20),
+        headers={
+            "Authorization": f"Bearer {OPENAI_API_KEY}",
+            "Content-Type": "application/json"
+        }
+    )
+    yield
+    await app.state.http.aclose()
+
+# 모든 엔드포인트 응답을 orjson으로 직렬화
+app = FastAPI(title="Game KPI Projection API", version="2.0.0", lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # CORS 설정 - 모든 origin 허용
 app.add_middleware(
@@ -21,23 +64,69 @@ app.add_middleware(
     expose_headers=["*"],
 )
 
-# Data paths
-DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
-RAW_DATA_PATH = os.path.join(DATA_DIR, "raw_game_data.json")
-CONFIG_PATH = os.path.join(DATA_DIR, "default_config.json")
+# CSV 업로드 파싱 청크 크기 (행)
+CSV_UPLOAD_CHUNK_ROWS = 50_000
+
+# Excel 다운로드 버퍼/스트리밍 크기
+EXCEL_SPOOL_MAX_SIZE = 8 * 1024 * 1024
+EXCEL_STREAM_CHUNK_SIZE = 64 * 1024
+
+# Data paths (모듈 로드 시 한 번만 절대 경로로 해석)
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+RAW_DATA_PATH = DATA_DIR / "raw_game_data.json"
+CONFIG_PATH = DATA_DIR / "default_config.json"
 
 # OpenAI API Configuration
 # API Keys (환경변수에서만 읽어옴 - 코드에 키 포함 금지!)
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY", "")
 OPENAI_API_URL = "https://api.openai.com/v1/chat/completions"
 
+# 파싱된 JSON 캐시 {경로: (mtime_ns, 데이터)} - 파일이 바뀔 때만 다시 파싱
+# 반환 dict는 요청 간에 공유되므로 호출 측에서 수정하지 말 것
+_json_cache: Dict[Path, tuple] = {}
+
+def _load_json_cached(path: Path):
+    mtime = path.stat().st_mtime_ns
+    cached = _json_cache.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    raw = path.read_bytes()
+    try:
+        data = orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        # orjson은 NaN/Infinity 리터럴을 거부하므로 json.dump로 저장된 파일은 표준 json으로 파싱
+        data = json.loads(raw)
+    _json_cache[path] = (mtime, data)
+    return data
+
 def load_raw_data():
-    with open(RAW_DATA_PATH, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return _load_json_cached(RAW_DATA_PATH)
 
 def load_config():
-    with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return _load_json_cached(CONFIG_PATH)
+
+# raw data 버전 (업로드 시 증가) - 표본 게임 기반 계산 캐시의 키로 파일 mtime과 함께 사용
+RAW_DATA_VERSION = 0
+
+def raw_data_version() -> tuple:
+    """현재 raw data 버전 토큰 (업로드 카운터, 파일 mtime) - 외부에서 파일을 교체해도 캐시 무효화"""
+    try:
+        mtime = RAW_DATA_PATH.stat().st_mtime_ns
+    except OSError:
+        mtime = 0
+    return (RAW_DATA_VERSION, mtime)
+
+def _atomic_write(path: Path, data: bytes):
+    """임시 파일에 쓴 뒤 os.replace로 교체 (쓰기 도중 크래시에도 기존 파일 보존)"""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmp_path, 0o644)  # mkstemp 기본 권한(0600) 대신 일반 파일 권한 유지
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
 
 # Pydantic Models
 class RetentionInput(BaseModel):
@@ -81,146 +170,6 @@ class ProjectionInput(BaseModel):
     bm_type: Optional[str] = "Midcore"  # Hardcore/Midcore/Casual/F2P_Cosmetic/Gacha
     regions: Optional[List[str]] = None  # ["korea", "japan", "global", ...]
 
-# ============================================
-# 글로벌 계절성 팩터 (지역별 월간 가중치)
-# ============================================
-SEASONALITY_BY_REGION = {
-    "korea": {1: 1.15, 2: 1.20, 3: 1.00, 4: 0.95, 5: 1.00, 6: 0.95, 7: 1.05, 8: 1.10, 9: 1.00, 10: 1.05, 11: 1.10, 12: 1.15},
-    "japan": {1: 1.10, 2: 1.05, 3: 1.05, 4: 1.10, 5: 1.15, 6: 0.95, 7: 1.00, 8: 1.05, 9: 1.00, 10: 1.00, 11: 1.05, 12: 1.20},
-    "china": {1: 1.10, 2: 1.25, 3: 1.00, 4: 0.95, 5: 1.05, 6: 1.10, 7: 1.05, 8: 1.00, 9: 1.00, 10: 1.20, 11: 1.15, 12: 1.05},
-    "global": {1: 0.95, 2: 0.90, 3: 0.95, 4: 1.00, 5: 1.00, 6: 1.00, 7: 1.05, 8: 1.00, 9: 1.00, 10: 1.05, 11: 1.15, 12: 1.25},
-    "sea": {1: 1.05, 2: 1.10, 3: 1.00, 4: 1.00, 5: 1.00, 6: 1.05, 7: 1.05, 8: 1.00, 9: 1.00, 10: 1.00, 11: 1.05, 12: 1.15},
-    "na": {1: 0.90, 2: 0.90, 3: 0.95, 4: 1.00, 5: 1.00, 6: 1.05, 7: 1.05, 8: 1.00, 9: 0.95, 10: 1.05, 11: 1.20, 12: 1.25},
-    "sa": {1: 1.10, 2: 1.05, 3: 1.00, 4: 0.95, 5: 0.95, 6: 1.00, 7: 1.05, 8: 1.00, 9: 1.00, 10: 1.05, 11: 1.10, 12: 1.15},
-    "eu": {1: 0.90, 2: 0.90, 3: 0.95, 4: 1.05, 5: 1.00, 6: 1.00, 7: 1.00, 8: 0.95, 9: 1.00, 10: 1.05, 11: 1.15, 12: 1.25},
-}
-
-def calculate_seasonality(regions: List[str], launch_date: str, days: int = 365) -> List[float]:
-    """
-    지역별 계절성 팩터 계산
-    - 월간 기본 계절성
-    - 주간 변동성 (주말 +15~20%)
-    - 특별 이벤트 스파이크 (명절, 대형 업데이트 등)
-    """
-    from datetime import datetime, timedelta
-    import random
-    
-    try:
-        start_date = datetime.strptime(launch_date, "%Y-%m-%d")
-    except:
-        start_date = datetime(2026, 11, 12)  # 기본값
-    
-    # 시드 고정 (재현성)
-    random.seed(42)
-    
-    # 특별 이벤트 날짜 (월-일 기준)
-    SPECIAL_EVENTS = {
-        "korea": [(1, 1), (2, 1), (2, 2), (5, 5), (9, 15), (9, 16), (9, 17), (12, 25), (12, 31)],  # 설날, 추석, 크리스마스 등
-        "japan": [(1, 1), (5, 3), (5, 4), (5, 5), (8, 15), (12, 25), (12, 31)],  # 신정, 골든위크, 오본 등
-        "global": [(1, 1), (11, 24), (11, 25), (12, 24), (12, 25), (12, 31)],  # 블랙프라이데이, 크리스마스 등
-        "na": [(1, 1), (7, 4), (11, 24), (11, 25), (12, 24), (12, 25), (12, 31)],
-        "eu": [(1, 1), (12, 24), (12, 25), (12, 31)],
-        "china": [(1, 1), (2, 1), (2, 2), (10, 1), (10, 2), (10, 3)],  # 춘절, 국경절
-        "sea": [(1, 1), (4, 13), (4, 14), (11, 1), (12, 25), (12, 31)],  # 송끄란 등
-        "sa": [(1, 1), (2, 13), (2, 14), (12, 25), (12, 31)],  # 카니발 등
-    }
-    
-    factors = []
-    for day in range(days):
-        current_date = start_date + timedelta(days=day)
-        month = current_date.month
-        weekday = current_date.weekday()  # 0=월, 6=일
-        month_day = (current_date.month, current_date.day)
-        
-        # 1. 월간 기본 계절성
-        region_factors = []
-        for region in regions:
-            region_key = region.lower()
-            if region_key in SEASONALITY_BY_REGION:
-                region_factors.append(SEASONALITY_BY_REGION[region_key].get(month, 1.0))
-        
-        base_factor = np.mean(region_factors) if region_factors else 1.0
-        
-        # 2. 주간 변동성 (금~일 +15~20%, 월~화 -5~10%)
-        if weekday == 4:  # 금요일
-            weekly_factor = 1.12 + random.uniform(0, 0.05)
-        elif weekday == 5:  # 토요일
-            weekly_factor = 1.18 + random.uniform(0, 0.07)
-        elif weekday == 6:  # 일요일
-            weekly_factor = 1.15 + random.uniform(0, 0.05)
-        elif weekday in [0, 1]:  # 월/화
-            weekly_factor = 0.92 + random.uniform(0, 0.05)
-        else:  # 수/목
-            weekly_factor = 1.0 + random.uniform(-0.02, 0.02)
-        
-        # 3. 특별 이벤트 스파이크 (+30~60%)
-        event_factor = 1.0
-        for region in regions:
-            region_key = region.lower()
-            if region_key in SPECIAL_EVENTS:
-                if month_day in SPECIAL_EVENTS[region_key]:
-                    event_factor = max(event_factor, 1.35 + random.uniform(0, 0.25))
-        
-        # 4. 대형 업데이트 시뮬레이션 (30일마다 +20~35%)
-        if day > 30 and (day % 30 < 3 or day % 30 > 27):
-            event_factor = max(event_factor, 1.20 + random.uniform(0, 0.15))
-        
-        # 5. 약간의 랜덤 노이즈 (±3%)
-        noise = 1.0 + random.uniform(-0.03, 0.03)
-        
-        final_factor = base_factor * weekly_factor * event_factor * noise
-        factors.append(final_factor)
-    
-    return factors
-
-# ============================================
-# Time-Decay 블렌딩 (시간에 따라 가중치 변경)
-# ============================================
-def calculate_time_decay_weight(day: int, days: int = 365) -> float:
-    """
-    시간 가중치 계산 (Time-Decay)
-    
-    D1: 내부 90% : 벤치마크 10%
-    D180: 내부 50% : 벤치마크 50%
-    D365: 내부 10% : 벤치마크 90%
-    
-    선형 보간으로 매일 가중치 변경
-    """
-    # D1 = 0.9, D365 = 0.1 (선형 감소)
-    weight_internal = 0.9 - (0.8 * (day - 1) / (days - 1)) if days > 1 else 0.9
-    return max(min(weight_internal, 0.9), 0.1)
-
-def calculate_time_decay_blended_retention(
-    internal_curve: List[float],
-    benchmark_curve: List[float],
-    days: int = 365,
-    quality_score: float = 1.0
-) -> List[float]:
-    """
-    Time-Decay 블렌딩 리텐션 커브 생성
-    
-    Args:
-        internal_curve: 내부 표본 리텐션 커브
-        benchmark_curve: 벤치마크 리텐션 커브
-        days: 프로젝션 기간
-        quality_score: 품질 점수 (S=1.2, A=1.1, B=1.0, C=0.9, D=0.8)
-    """
-    blended = []
-    for day in range(days):
-        weight_internal = calculate_time_decay_weight(day + 1, days)
-        weight_benchmark = 1 - weight_internal
-        
-        internal_val = internal_curve[day] if day < len(internal_curve) else internal_curve[-1]
-        benchmark_val = benchmark_curve[day] if day < len(benchmark_curve) else benchmark_curve[-1]
-        
-        # 벤치마크에 품질 점수 적용
-        adjusted_benchmark = benchmark_val * quality_score
-        
-        blended_val = (internal_val * weight_internal) + (adjusted_benchmark * weight_benchmark)
-        blended.append(max(min(blended_val, 1.0), 0.001))
-    
-    return blended
-
 # ============================================
 # Quality Score 정의
 # ============================================
@@ -275,110 +224,156 @@ BENCHMARK_DATA = {
     }
 }
 
-def get_benchmark_data(genre: str, platforms: List[str]) -> Dict[str, float]:
-    """장르/플랫폼에 맞는 벤치마크 데이터 반환 (다중 플랫폼은 평균)"""
-    if not platforms:
-        platforms = ["PC"]
+# 조회용 SoA 배열: (플랫폼 × 장르 × 지표) float64, 인덱스 dict로 위치 조회
+BENCHMARK_METRICS = ("d1", "d7", "d30", "d90", "pr", "arppu")
+PLATFORM_IDX = {platform: i for i, platform in enumerate(BENCHMARK_DATA)}
+GENRE_IDX = {genre: i for i, genre in enumerate(BENCHMARK_DATA["PC"])}
+BENCHMARK_ARR = np.array([
+    [[BENCHMARK_DATA[platform][genre][metric] for metric in BENCHMARK_METRICS] for genre in GENRE_IDX]
+    for platform in PLATFORM_IDX
+], dtype=np.float64)
+
+@lru_cache(maxsize=256)
+def get_benchmark_data(genre: str, platforms: tuple) -> Dict[str, float]:
+    """
+    장르/플랫폼에 맞는 벤치마크 데이터 반환 (다중 플랫폼은 평균)
     
-    values = []
-    for platform in platforms:
-        if platform in BENCHMARK_DATA and genre in BENCHMARK_DATA[platform]:
-            values.append(BENCHMARK_DATA[platform][genre])
+    결과가 캐시되어 공유되므로 호출 측에서 값을 바꿀 때는 복사해서 사용
+    """
+    if not platforms:
+        platforms = ("PC",)
     
-    if not values:
+    platform_rows = [PLATFORM_IDX[p] for p in platforms if p in PLATFORM_IDX]
+    if not platform_rows or genre not in GENRE_IDX:
         # 기본값 (PC/MMORPG)
         return {"d1": 0.32, "d7": 0.20, "d30": 0.11, "d90": 0.06, "pr": 0.06, "arppu": 78000}
     
-    # 다중 플랫폼이면 평균
-    return {
-        "d1": np.mean([v["d1"] for v in values]),
-        "d7": np.mean([v["d7"] for v in values]),
-        "d30": np.mean([v["d30"] for v in values]),
-        "d90": np.mean([v["d90"] for v in values]),
-        "pr": np.mean([v["pr"] for v in values]),
-        "arppu": np.mean([v["arppu"] for v in values]),
-    }
+    # 다중 플랫폼이면 평균 (선택된 플랫폼 행을 한 번에 gather)
+    averaged = BENCHMARK_ARR[platform_rows, GENRE_IDX[genre]].mean(axis=0)
+    return dict(zip(BENCHMARK_METRICS, averaged.tolist()))
 
-def generate_benchmark_retention_curve(benchmark: Dict[str, float], days: int = 365) -> List[float]:
-    """벤치마크 데이터로 Power Law 리텐션 커브 생성"""
-    # D1, D7, D30, D90 데이터로 회귀분석
+# Retention Curve: a * (day)^b
+def retention_curve(x, a, b):
+    return a * np.power(x, b)
+
+def _fit_benchmark_coefficients(points: tuple) -> tuple:
+    """D1, D7, D30, D90 벤치마크 리텐션으로 Power Law (a, b) 회귀"""
     x_data = np.array([1, 7, 30, 90])
-    y_data = np.array([benchmark["d1"], benchmark["d7"], benchmark["d30"], benchmark["d90"]])
+    y_data = np.array(points)
     
     try:
         popt, _ = curve_fit(retention_curve, x_data, y_data, p0=[0.5, -0.3], maxfev=5000)
         a, b = popt
     except:
-        a, b = benchmark["d1"], -0.5  # 기본값
+        a, b = points[0], -0.5  # 기본값
+    return float(a), float(b)
+
+def _benchmark_points(benchmark: Dict[str, float]) -> tuple:
+    return (benchmark["d1"], benchmark["d7"], benchmark["d30"], benchmark["d90"])
+
+# 플랫폼/장르별 벤치마크 (a, b) 계수를 import 시 한 번만 회귀 (요청마다 curve_fit 반복 방지)
+# 다중 플랫폼 평균처럼 테이블에 없는 조합은 첫 요청 때 회귀 후 저장
+_BENCHMARK_COEFFS = {
+    _benchmark_points(bench): _fit_benchmark_coefficients(_benchmark_points(bench))
+    for genres in BENCHMARK_DATA.values()
+    for bench in genres.values()
+}
+
+def generate_benchmark_retention_curve(benchmark: Dict[str, float], days: int = 365) -> np.ndarray:
+    """벤치마크 데이터로 Power Law 리텐션 커브 생성"""
+    # D1, D7, D30, D90 데이터로 회귀분석 (사전 계산된 계수 우선 사용)
+    points = _benchmark_points(benchmark)
+    coeffs = _BENCHMARK_COEFFS.get(points)
+    if coeffs is None:
+        coeffs = _BENCHMARK_COEFFS[points] = _fit_benchmark_coefficients(points)
+    a, b = coeffs
+    
+    days_arr = np.arange(1, days + 1, dtype=np.float64)
+    return np.clip(a * np.power(days_arr, b), 0.001, 1.0)
+
+@lru_cache(maxsize=128)
+def _build_benchmark(genre: str, platforms_t: tuple, bm_type: str, days: int):
+    """
+    장르/플랫폼/BM 타입별 벤치마크 지표 + 리텐션 커브 (요청 간 캐시)
     
-    curve = []
-    for day in range(1, days + 1):
-        ret = a * np.power(day, b)
-        ret = max(min(ret, 1.0), 0.001)
-        curve.append(ret)
+    캐시된 값이 요청 간에 공유되므로 불변 형태로 반환:
+    - 벤치마크 지표: (key, value) 튜플 (호출 측에서 dict로 복사해서 사용)
+    - 리텐션 커브: 읽기 전용 ndarray
+    """
+    bm_modifier = BM_TYPE_MODIFIERS.get(bm_type, {"pr_mod": 1.0, "arppu_mod": 1.0})
+    benchmark = dict(get_benchmark_data(genre, platforms_t))
+    benchmark["pr"] = benchmark["pr"] * bm_modifier["pr_mod"]
+    benchmark["arppu"] = benchmark["arppu"] * bm_modifier["arppu_mod"]
     
-    return curve
+    curve = generate_benchmark_retention_curve(benchmark, days)
+    curve.setflags(write=False)
+    return tuple(benchmark.items()), curve
+
+def _blend(internal, bench, w: float, lo: float, hi: float, n: int) -> np.ndarray:
+    """내부 표본(배열)과 벤치마크(스칼라 또는 배열)의 가중 평균을 [lo, hi]로 클램프"""
+    internal_arr = pad_to(internal, n)
+    bench_arr = np.asarray(bench, dtype=np.float64)
+    if bench_arr.ndim > 0:
+        bench_arr = pad_to(bench_arr, n)
+    return np.clip(internal_arr * w + bench_arr * (1.0 - w), lo, hi)
 
 def calculate_blended_retention(
-    internal_curve: List[float],
-    benchmark_curve: List[float],
+    internal_curve: np.ndarray,
+    benchmark_curve: np.ndarray,
     weight_internal: float
-) -> List[float]:
+) -> np.ndarray:
     """내부 표본과 벤치마크를 블렌딩한 리텐션 커브 생성"""
-    weight_benchmark = 1 - weight_internal
-    
-    blended = []
-    for i in range(len(internal_curve)):
-        internal_val = internal_curve[i] if i < len(internal_curve) else internal_curve[-1]
-        benchmark_val = benchmark_curve[i] if i < len(benchmark_curve) else benchmark_curve[-1]
-        blended_val = (internal_val * weight_internal) + (benchmark_val * weight_benchmark)
-        blended.append(max(min(blended_val, 1.0), 0.001))
-    
-    return blended
+    return _blend(internal_curve, benchmark_curve, weight_internal, 0.001, 1.0, len(internal_curve))
 
 def calculate_blended_pr(
-    internal_pr: List[float],
+    internal_pr: np.ndarray,
     benchmark_pr: float,
     weight_internal: float,
     days: int = 365
-) -> List[float]:
+) -> np.ndarray:
     """PR 블렌딩"""
-    weight_benchmark = 1 - weight_internal
-    
-    blended = []
-    for i in range(days):
-        internal_val = internal_pr[i] if i < len(internal_pr) else internal_pr[-1]
-        blended_val = (internal_val * weight_internal) + (benchmark_pr * weight_benchmark)
-        blended.append(max(min(blended_val, 1.0), 0.001))
-    
-    return blended
+    return _blend(internal_pr, benchmark_pr, weight_internal, 0.001, 1.0, days)
 
 def calculate_blended_arppu(
-    internal_arppu: List[float],
+    internal_arppu: np.ndarray,
     benchmark_arppu: float,
     weight_internal: float,
     days: int = 365
-) -> List[float]:
+) -> np.ndarray:
     """ARPPU 블렌딩"""
-    weight_benchmark = 1 - weight_internal
-    
-    blended = []
-    for i in range(days):
-        internal_val = internal_arppu[i] if i < len(internal_arppu) else internal_arppu[-1]
-        blended_val = (internal_val * weight_internal) + (benchmark_arppu * weight_benchmark)
-        blended.append(max(blended_val, 1000))
-    
-    return blended
+    return _blend(internal_arppu, benchmark_arppu, weight_internal, 1000, np.inf, days)
 
 class AIInsightRequest(BaseModel):
     projection_summary: Dict[str, Any]
     analysis_type: str = "general"  # general, retention, nru, revenue, risk
 
-# Retention Curve: a * (day)^b
-def retention_curve(x, a, b):
-    return a * np.power(x, b)
+# create_insight_prompt가 전용 프롬프트를 가진 분석 유형
+AI_ANALYSIS_TYPES = ("executive_report", "general", "reliability", "retention", "revenue", "risk", "competitive")
+
+class BatchAIInsightRequest(BaseModel):
+    projection_summary: Dict[str, Any]
+    analysis_types: List[str] = Field(default=["general"], min_length=1, max_length=len(AI_ANALYSIS_TYPES))
+    
+    @field_validator("analysis_types")
+    @classmethod
+    def _known_unique_types(cls, analysis_types: List[str]) -> List[str]:
+        """알 수 없는 유형은 거부하고 중복은 제거 (같은 유형을 동시에 여러 번 호출하지 않도록, 순서 유지)"""
+        unknown = [t for t in analysis_types if t not in AI_ANALYSIS_TYPES]
+        if unknown:
+            raise ValueError(f"unknown analysis_types: {unknown} (available: {list(AI_ANALYSIS_TYPES)})")
+        return list(dict.fromkeys(analysis_types))
 
 def fit_retention_curve(retention_data: List[float]):
+    """
+    리텐션 데이터 Power Law (a × day^b) 회귀
+    
+    log(y) = log(a) + b·log(x) 로 선형화해 닫힌 형태의 가중 최소제곱으로 계산하고,
+    결과가 범위(a ∈ [0, 2], b ∈ [-2, 0])를 벗어날 때만 bounded curve_fit 사용
+    
+    로그 변환 후에는 리텐션이 낮은 후반부 포인트의 오차가 부풀려져 회귀를 지배하므로,
+    log 공간 표준편차(≈ σ / y)의 역수인 y를 각 포인트 가중치로 적용
+    (선형 공간 curve_fit 결과와 거의 동일한 계수를 닫힌 형태로 얻음)
+    """
     days = np.arange(1, len(retention_data) + 1)
     retention = np.array(retention_data)
     
@@ -386,6 +381,15 @@ def fit_retention_curve(retention_data: List[float]):
     if np.sum(valid_mask) < 3:
         return None, None
     
+    lx = np.log(days[valid_mask])
+    ly = np.log(retention[valid_mask])
+    w = retention[valid_mask]
+    design = np.c_[np.ones_like(lx), lx]
+    (log_a, b), *_ = np.linalg.lstsq(design * w[:, None], ly * w, rcond=None)
+    a = np.exp(log_a)
+    if 0 <= a <= 2 and -2 <= b <= 0:
+        return a, b
+    
     try:
         popt, _ = curve_fit(
             retention_curve, 
@@ -399,66 +403,132 @@ def fit_retention_curve(retention_data: List[float]):
     except:
         return retention_data[0], -0.5
 
+def fit_retention_curves_batch(series_list: List[List[float]]):
+    """
+    여러 게임의 리텐션 커브를 한 번에 회귀 (fit_retention_curve의 배치 버전)
+    
+    게임별 시리즈를 (게임 수, 최대 길이) 배열로 패딩하고, 게임마다 2×2 가중 정규방정식을
+    한 번의 batched np.linalg.solve로 풀어 (a, b) 계산
+    
+    Returns:
+        (a 배열, b 배열) - 유효 포인트가 3개 미만인 게임은 NaN
+    """
+    n_games = len(series_list)
+    max_len = max((len(v) for v in series_list), default=0)
+    a_vals = np.full(n_games, np.nan)
+    b_vals = np.full(n_games, np.nan)
+    if max_len == 0:
+        return a_vals, b_vals
+    
+    retention = np.full((n_games, max_len), np.nan)
+    for i, values in enumerate(series_list):
+        retention[i, :len(values)] = values
+    
+    with np.errstate(invalid='ignore'):
+        valid = (retention > 0) & (retention <= 1)
+    fit_rows = valid.sum(axis=1) >= 3
+    if not fit_rows.any():
+        return a_vals, b_vals
+    
+    valid = valid[fit_rows]
+    lx = np.log(np.arange(1, max_len + 1, dtype=np.float64))
+    ly = np.log(np.where(valid, retention[fit_rows], 1.0))
+    # fit_retention_curve와 동일한 가중치(w = y)의 제곱, 무효 포인트는 0
+    w2 = np.where(valid, retention[fit_rows], 0.0) ** 2
+    
+    s0 = w2.sum(axis=1)
+    s1 = (w2 * lx).sum(axis=1)
+    s2 = (w2 * lx * lx).sum(axis=1)
+    normal_matrix = np.stack([np.stack([s0, s1], axis=-1), np.stack([s1, s2], axis=-1)], axis=-2)
+    rhs = np.stack([(w2 * ly).sum(axis=1), (w2 * lx * ly).sum(axis=1)], axis=-1)
+    
+    log_a, b = np.linalg.solve(normal_matrix, rhs[..., None])[..., 0].T
+    a_vals[fit_rows] = np.exp(log_a)
+    b_vals[fit_rows] = b
+    return a_vals, b_vals
+
+# 게임별 리텐션 회귀 결과 캐시 {게임명: (회귀에 사용한 리텐션 리스트, a, b)}
+# raw data 캐시가 같은 리스트 객체를 들고 있는 동안은 재사용하고, 업로드/파일 변경으로
+# 리스트가 교체된 게임만 다시 회귀 (업로드는 해당 metric의 바뀐 게임 리스트만 새로 만듦)
+_retention_fit_cache: Dict[str, tuple] = {}
+
+def _refresh_retention_fits(games: List[str], retention_games: dict):
+    """캐시에 없거나 데이터가 바뀐 게임을 한 번에 배치 회귀해 캐시에 저장"""
+    stale = [
+        game for game in dict.fromkeys(games)
+        if _retention_fit_cache.get(game, (None,))[0] is not retention_games[game]
+    ]
+    if not stale:
+        return
+    
+    series_list = [retention_games[game] for game in stale]
+    a_values, b_values = fit_retention_curves_batch(series_list)
+    
+    # 범위(a ∈ [0, 2], b ∈ [-2, 0])를 벗어난 게임만 개별 bounded 회귀로 재계산
+    out_of_bounds = ~np.isnan(a_values) & ~((a_values >= 0) & (a_values <= 2) & (b_values >= -2) & (b_values <= 0))
+    for i in np.flatnonzero(out_of_bounds):
+        a_values[i], b_values[i] = fit_retention_curve(series_list[i])
+    
+    for game, series, a, b in zip(stale, series_list, a_values.tolist(), b_values.tolist()):
+        _retention_fit_cache[game] = (series, a, b)
+
 def calculate_retention_coefficients(selected_games: List[str], raw_data: dict):
     retention_games = raw_data['games']['retention']
     
-    a_values = []
-    b_values = []
+    games = [game for game in selected_games if game in retention_games]
+    if not games:
+        return 1.0, -0.5
+    
+    _refresh_retention_fits(games, retention_games)
     
-    for game in selected_games:
-        if game in retention_games:
-            a, b = fit_retention_curve(retention_games[game])
-            if a is not None:
-                a_values.append(a)
-                b_values.append(b)
+    a_values = np.array([_retention_fit_cache[game][1] for game in games])
+    b_values = np.array([_retention_fit_cache[game][2] for game in games])
     
-    if not a_values:
+    fitted = ~np.isnan(a_values)
+    if not fitted.any():
         return 1.0, -0.5
     
-    return np.mean(a_values), np.mean(b_values)
+    return np.mean(a_values[fitted]), np.mean(b_values[fitted])
 
-def generate_retention_curve(a: float, b: float, target_d1: float, days: int = 365):
-    base_d1 = retention_curve(1, a, b)
-    if base_d1 > 0:
-        scale_factor = target_d1 / base_d1
-    else:
-        scale_factor = 1.0
-    
-    curve = []
-    for day in range(1, days + 1):
-        ret = retention_curve(day, a, b) * scale_factor
-        curve.append(min(max(ret, 0.001), 1))
-    
-    return curve
+def base_retention_curve(a: float, b: float, days: int = 365) -> np.ndarray:
+    """스케일 적용 전 Power Law 리텐션 커브 (D1~D{days})"""
+    return retention_curve(np.arange(1, days + 1, dtype=np.float64), a, b)
+
+def scale_retention_curve(base_curve: np.ndarray, base_d1: float, target_d1: float) -> np.ndarray:
+    """미리 계산한 base 커브를 target_d1에 맞게 스케일 (시나리오별로는 곱셈 한 번)"""
+    scale_factor = target_d1 / base_d1 if base_d1 > 0 else 1.0
+    return np.clip(base_curve * scale_factor, 0.001, 1.0)
+
+def _stack_game_series(series_by_game: dict, valid_games: List[str]) -> np.ndarray:
+    """선택 게임들의 일별 시리즈를 공통 길이(최대 365일)로 잘라 (게임 수, 일수) 배열로 쌓음"""
+    min_len = min(min(len(series_by_game[g]) for g in valid_games), 365)
+    stacked = np.array([series_by_game[g][:min_len] for g in valid_games], dtype=np.float64)
+    return stacked.reshape(len(valid_games), min_len)
+
+def _masked_daily_mean(values: np.ndarray, mask: np.ndarray, default: float) -> np.ndarray:
+    """mask가 True인 값들만으로 일별(axis=0) 평균, 유효한 값이 없는 날은 default"""
+    counts = mask.sum(axis=0)
+    sums = np.where(mask, values, 0.0).sum(axis=0)
+    return np.where(counts > 0, sums / np.maximum(counts, 1), default)
 
-def calculate_nru_pattern(selected_games: List[str], raw_data: dict):
+def calculate_nru_pattern(selected_games: List[str], raw_data: dict) -> np.ndarray:
     nru_games = raw_data['games']['nru']
     
     valid_games = [g for g in selected_games if g in nru_games]
     if not valid_games:
-        return [0.98 ** i for i in range(365)]
-    
-    min_len = min(len(nru_games[g]) for g in valid_games)
-    min_len = min(min_len, 365)
-    
-    daily_ratios = []
-    for day in range(1, min_len):
-        day_ratios = []
-        for game in valid_games:
-            data = nru_games[game]
-            if day < len(data) and data[day-1] > 0:
-                ratio = data[day] / data[day-1]
-                if 0 < ratio < 2:
-                    day_ratios.append(ratio)
-        if day_ratios:
-            daily_ratios.append(np.mean(day_ratios))
-        else:
-            daily_ratios.append(0.98)
-    
-    while len(daily_ratios) < 364:
-        daily_ratios.append(daily_ratios[-1] if daily_ratios else 0.98)
-    
-    return daily_ratios
+        return np.power(0.98, np.arange(365))
+    
+    data = _stack_game_series(nru_games, valid_games)
+    
+    # 전일 대비 비율 (전일 NRU가 0이면 제외, 0 < ratio < 2 인 값만 사용)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratios = data[:, 1:] / np.where(data[:, :-1] > 0, data[:, :-1], np.nan)
+        valid = (ratios > 0) & (ratios < 2)
+    daily_ratios = _masked_daily_mean(ratios, valid, 0.98)
+    
+    if daily_ratios.size == 0:
+        return np.full(364, 0.98)
+    return pad_to(daily_ratios, 364)
 
 def generate_nru_series(total_nru: int, daily_ratios: List[float], days: int = 365, 
                          launch_period: int = 30, sustaining_ratio: float = 0.1):
@@ -478,68 +548,37 @@ def generate_nru_series(total_nru: int, daily_ratios: List[float], days: int = 3
         sustaining_ratio: 런칭 후 유지 NRU 비율 (기본 10%)
     
     Returns:
-        일별 NRU 리스트
+        일별 NRU 배열 (int64 ndarray)
     """
-    nru_series = []
-    
     # 🔥 핵심 수정: Area Normalization
     # Step 1: 런칭 기간 NRU 패턴 생성 (Power Law Decay: 1/t^0.8)
-    nru_decay_pattern = []
-    for t in range(1, launch_period + 1):
-        decay_value = 1.0 / (t ** 0.8)  # D1=1.0, D2=0.57, D3=0.44, ...
-        nru_decay_pattern.append(decay_value)
+    t = np.arange(1, launch_period + 1, dtype=np.float64)
+    nru_decay_pattern = 1.0 / (t ** 0.8)  # D1=1.0, D2=0.57, D3=0.44, ...
     
     # Step 2: 패턴의 면적(Area) 계산 - 총량 보존의 법칙!
-    pattern_area = sum(nru_decay_pattern)
+    pattern_area = nru_decay_pattern.sum()
     
     # Step 3: D1 Scale Factor = 총 유저 수 / 패턴 면적
     # 이렇게 하면 런칭 기간 NRU의 합 = total_nru가 됨
     d1_scale = total_nru / pattern_area if pattern_area > 0 else 0
     
-    # Phase 1: 런칭 기간 (D1~D30) - 정규화된 패턴 적용
-    for day in range(min(launch_period, days)):
-        # 정규화된 NRU = Scale × 패턴값
-        daily_nru = int(d1_scale * nru_decay_pattern[day])
-        nru_series.append(max(daily_nru, 10))  # 최소값 10으로 설정
+    # 런칭 + 유지 기간을 float 버퍼 하나에 채운 뒤 마지막에 정수 변환/최소값(10)을 한 번만 적용
+    n_launch = min(launch_period, days)
+    nru_float = np.empty(max(days, 0), dtype=np.float64)
+    
+    # Phase 1: 런칭 기간 (D1~D30) - 정규화된 패턴 적용 (최소값 10)
+    nru_float[:n_launch] = d1_scale * nru_decay_pattern[:n_launch]
     
     # Phase 2: 런칭 후 유지 기간 (D31~D365)
     # D30의 NRU를 기준으로 sustaining_ratio만큼 유지
-    d30_nru = nru_series[-1] if nru_series else 100
+    d30_nru = max(int(nru_float[n_launch - 1]), 10) if n_launch > 0 else 100
     sustaining_nru = int(d30_nru * sustaining_ratio * 10)  # D30의 ~100% 수준에서 시작
     
-    for day in range(launch_period, days):
-        # 유지 기간에도 서서히 감소 (월 5% 감소)
-        months_after_launch = (day - launch_period) / 30
-        decay = np.exp(-0.05 * months_after_launch)
-        daily_nru = int(sustaining_nru * decay)
-        nru_series.append(max(daily_nru, 10))
+    # 유지 기간에도 서서히 감소 (월 5% 감소)
+    months_after_launch = (np.arange(launch_period, days) - launch_period) / 30
+    nru_float[n_launch:] = sustaining_nru * np.exp(-0.05 * months_after_launch)
     
-    return nru_series[:days]
-
-
-# ============================================
-# V8.5: UA/Brand 분리 NRU 계산 (Organic Boost)
-# ============================================
-def calculate_organic_boost(brand_budget: int, ua_budget: int) -> float:
-    """
-    브랜딩 예산에 따른 Organic Ratio 증폭 계수 계산
-    
-    로직:
-    - brand_budget이 ua_budget의 0%일 때: 1.0배 (증폭 없음)
-    - brand_budget이 ua_budget의 50%일 때: 1.5배
-    - brand_budget이 ua_budget의 100%일 때: 2.0배
-    - brand_budget이 ua_budget의 200%일 때: 2.5배 (수확체감)
-    
-    Logarithmic 함수를 사용해 수확체감 효과 적용
-    """
-    if ua_budget <= 0:
-        return 1.0
-    
-    ratio = brand_budget / ua_budget
-    # Logarithmic boost: 1 + ln(1 + ratio) * 0.7
-    # ratio=0.5 → 1.28배, ratio=1.0 → 1.49배, ratio=2.0 → 1.77배
-    boost = 1.0 + np.log(1 + ratio) * 0.7
-    return min(boost, 3.0)  # 최대 3배로 캡
+    return np.maximum(nru_float.astype(np.int64), 10)
 
 
 def generate_nru_series_v85(
@@ -580,8 +619,6 @@ def generate_nru_series_v85(
     Returns:
         (nru_series, paid_nru_total, organic_nru_total, organic_boost, meta_info)
     """
-    import math
-    
     # ============================================
     # 1. CPA Saturation Effect (시장 포화)
     # ============================================
@@ -629,63 +666,57 @@ def generate_nru_series_v85(
     # ============================================
     # 브랜딩 효과는 Bell Curve로 서서히 나타나고 잔존
     # D-30 ~ D+60 구간에 정규분포로 분산
-    brand_effect_curve = []
+    day_idx = np.arange(days, dtype=np.float64)
     if brand_time_lag_enabled and brand_budget > 0:
         # 정규분포 (평균=15, 표준편차=20) → D1~D60 구간에 효과 분포
-        for day in range(days):
-            # Bell curve centered at D15 with spread of 20 days
-            effect = math.exp(-0.5 * ((day - 15) / 20) ** 2)
-            brand_effect_curve.append(effect)
+        # Bell curve centered at D15 with spread of 20 days
+        brand_effect_curve = np.exp(-0.5 * ((day_idx - 15) / 20) ** 2)
         # 정규화
-        total_effect = sum(brand_effect_curve)
-        brand_effect_curve = [e / total_effect for e in brand_effect_curve] if total_effect > 0 else [0] * days
+        total_effect = brand_effect_curve.sum()
+        brand_effect_curve = brand_effect_curve / total_effect if total_effect > 0 else np.zeros(days)
     else:
         # Time-Lag 비활성화 시 즉시 효과
-        brand_effect_curve = [1.0 / 30 if i < 30 else 0 for i in range(days)]
+        brand_effect_curve = np.where(day_idx < 30, 1.0 / 30, 0.0)
     
     # ============================================
-    # 5. NRU 시리즈 생성 (통합)
+    # 5. NRU 시리즈 생성 (통합, 일별 루프 없이 배열 연산)
     # ============================================
-    nru_series = [0] * days
+    nru_series = np.zeros(days, dtype=np.int64)
     
     # 5-1. Pre-Launch Burst (D1~D3 폭발)
-    for i, ratio in enumerate(burst_distribution):
-        if i < days:
-            nru_series[i] += int(d1_burst_users * ratio)
+    n_burst = min(len(burst_distribution), days)
+    nru_series[:n_burst] += (d1_burst_users * np.asarray(burst_distribution[:n_burst])).astype(np.int64)
     
     # 5-2. Post-Launch UA (런칭 후 퍼포먼스 마케팅)
     # Area Normalization으로 30일간 분배
-    nru_decay_pattern = [1.0 / (t ** 0.8) for t in range(1, launch_period + 1)]
-    pattern_area = sum(nru_decay_pattern)
+    nru_decay_pattern = 1.0 / np.arange(1, launch_period + 1, dtype=np.float64) ** 0.8
+    pattern_area = nru_decay_pattern.sum()
     d1_scale = post_launch_paid_nru / pattern_area if pattern_area > 0 else 0
     
-    for day in range(min(launch_period, days)):
-        daily_nru = int(d1_scale * nru_decay_pattern[day])
-        nru_series[day] += max(daily_nru, 0)
+    n_launch = min(launch_period, days)
+    nru_series[:n_launch] += np.maximum((d1_scale * nru_decay_pattern[:n_launch]).astype(np.int64), 0)
     
     # 5-3. Organic NRU (Brand Time-Lag 적용)
-    for day in range(days):
-        organic_daily = int(organic_nru_total * brand_effect_curve[day])
-        nru_series[day] += organic_daily
+    nru_series += (organic_nru_total * brand_effect_curve).astype(np.int64)
     
     # 5-4. Sustaining 기간 (D31~D365)
     # [FIX] Sustaining은 비용으로만 처리, NRU는 최소한으로 유지
     # 월 매출의 7%를 Sustaining에 쓰지만, 이는 ROAS 계산에만 반영
     # 실제 NRU는 자연 감쇠 (D30 대비 급격히 감소)
-    d30_nru = nru_series[29] if len(nru_series) > 29 else 100
+    d30_nru = int(nru_series[29]) if days > 29 else 100
     
     # Sustaining NRU는 D30의 5% 수준에서 시작, 빠르게 감쇠
     base_sustaining_nru = int(d30_nru * 0.05)  # D30의 5% (기존 20%에서 크게 축소)
     
-    for day in range(launch_period, days):
-        months_after_launch = (day - launch_period) / 30
+    if days > launch_period:
+        months_after_launch = (day_idx[launch_period:] - launch_period) / 30
         # [FIX] 더 가파른 감쇠율 적용 (월 10% 감소 → 6개월 후 ~53%, 12개월 후 ~28%)
         decay = np.exp(-0.1 * months_after_launch)
-        daily_nru = int(base_sustaining_nru * decay)
-        nru_series[day] += max(daily_nru, 5)  # 최소값 10 → 5로 축소
+        daily_nru = (base_sustaining_nru * decay).astype(np.int64)
+        nru_series[launch_period:] += np.maximum(daily_nru, 5)  # 최소값 10 → 5로 축소
     
     # 최소값 보장 (5명 이하로 떨어지지 않음)
-    nru_series = [max(nru, 5) for nru in nru_series]
+    nru_series = np.maximum(nru_series, 5)
     
     # ============================================
     # 6. 메타 정보 반환
@@ -701,78 +732,85 @@ def generate_nru_series_v85(
         "brand_time_lag_peak_day": 15 if brand_time_lag_enabled else 1
     }
     
-    return nru_series[:days], total_paid_nru, organic_nru_total, organic_boost, meta_info
+    return nru_series, total_paid_nru, organic_nru_total, organic_boost, meta_info
 
-def calculate_pr_pattern(selected_games: List[str], raw_data: dict):
+def calculate_pr_pattern(selected_games: List[str], raw_data: dict) -> np.ndarray:
     pr_games = raw_data['games']['payment_rate']
     
     valid_games = [g for g in selected_games if g in pr_games]
     if not valid_games:
-        return [0.02] * 365
-    
-    min_len = min(len(pr_games[g]) for g in valid_games)
-    min_len = min(min_len, 365)
+        return np.full(365, 0.02)
     
-    pattern = []
-    for day in range(min_len):
-        day_values = [pr_games[g][day] for g in valid_games if day < len(pr_games[g]) and pr_games[g][day] > 0]
-        avg_pr = np.mean(day_values) if day_values else 0.02
-        pattern.append(max(avg_pr, 0.001))
+    data = _stack_game_series(pr_games, valid_games)
+    pattern = np.maximum(_masked_daily_mean(data, data > 0, 0.02), 0.001)
     
-    while len(pattern) < 365:
-        pattern.append(pattern[-1] if pattern else 0.02)
-    
-    return pattern[:365]
+    if pattern.size == 0:
+        return np.full(365, 0.02)
+    return pad_to(pattern, 365)
 
-def calculate_arppu_pattern(selected_games: List[str], raw_data: dict):
+def calculate_arppu_pattern(selected_games: List[str], raw_data: dict) -> np.ndarray:
     arppu_games = raw_data['games']['arppu']
     
     valid_games = [g for g in selected_games if g in arppu_games]
     if not valid_games:
-        return [50000] * 365
-    
-    min_len = min(len(arppu_games[g]) for g in valid_games)
-    min_len = min(min_len, 365)
+        return np.full(365, 50000.0)
     
-    pattern = []
-    for day in range(min_len):
-        day_values = [arppu_games[g][day] for g in valid_games if day < len(arppu_games[g]) and arppu_games[g][day] > 0]
-        avg_arppu = np.mean(day_values) if day_values else 50000
-        pattern.append(max(avg_arppu, 1000))
+    data = _stack_game_series(arppu_games, valid_games)
+    pattern = np.maximum(_masked_daily_mean(data, data > 0, 50000), 1000)
     
-    while len(pattern) < 365:
-        pattern.append(pattern[-1] if pattern else 50000)
-    
-    return pattern[:365]
+    if pattern.size == 0:
+        return np.full(365, 50000.0)
+    return pad_to(pattern, 365)
 
-def calculate_dau_matrix(nru_series: List[int], retention_curve: List[float], days: int = 365):
+# ============================================
+# 표본 게임 기반 계산 캐시 (선택 게임 + raw data 버전 단위)
+# ============================================
+# 게임 목록은 정렬된 tuple로 받음 (중복 선택은 평균 가중치에 반영되므로 유지)
+# 반환 배열은 캐시에서 공유되므로 읽기 전용
+@lru_cache(maxsize=256)
+def cached_retention_coefficients(selected_games: tuple, version: tuple) -> tuple:
+    return calculate_retention_coefficients(list(selected_games), load_raw_data())
+
+@lru_cache(maxsize=256)
+def cached_pr_pattern(selected_games: tuple, version: tuple) -> np.ndarray:
+    pattern = calculate_pr_pattern(list(selected_games), load_raw_data())
+    pattern.setflags(write=False)
+    return pattern
+
+@lru_cache(maxsize=256)
+def cached_arppu_pattern(selected_games: tuple, version: tuple) -> np.ndarray:
+    pattern = calculate_arppu_pattern(list(selected_games), load_raw_data())
+    pattern.setflags(write=False)
+    return pattern
+
+def calculate_dau_matrix(nru_series: np.ndarray, retention_curve: np.ndarray, days: int = 365) -> np.ndarray:
     """
     [R1 Fix] DAU 코호트 계산
     - D0 (설치 당일): 리텐션 = 1.0 (100%)
     - D1 이후: retention_curve[days_since_install - 1]
+    
+    DAU[t] = Σ_cohort NRU[cohort] × Retention[t - cohort] 이므로
+    이중 루프 대신 1D 컨볼루션 한 번으로 계산 (장기 프로젝션은 FFT 컨볼루션)
     """
-    daily_dau = []
-    
-    for active_day in range(days):
-        total_dau = 0
-        for cohort_day in range(active_day + 1):
-            days_since_install = active_day - cohort_day
-            
-            if cohort_day < len(nru_series):
-                nru = nru_series[cohort_day]
-                
-                if days_since_install == 0:
-                    retention = 1.0
-                else:
-                    idx = days_since_install - 1
-                    retention = retention_curve[idx] if idx < len(retention_curve) else 0
-                
-                total_dau += nru * retention
-        daily_dau.append(int(total_dau))
-    
-    return daily_dau
-
-def calculate_revenue(dau: List[float], pr: List[float], arppu: List[float]):
+    if days <= 0:
+        return np.zeros(0, dtype=np.int64)
+    
+    nru = np.asarray(nru_series, dtype=np.float64)[:days]
+    # 설치 당일(D0) 리텐션 1.0 + D1 이후 리텐션 커브 (커브 범위를 벗어난 날은 0)
+    kernel = np.concatenate(([1.0], np.asarray(retention_curve, dtype=np.float64)[:max(days - 1, 0)]))
+    
+    if nru.size == 0:
+        dau = np.zeros(days)
+    elif days > 1024:
+        dau = np.maximum(fftconvolve(nru, kernel)[:days], 0.0)
+    else:
+        dau = np.convolve(nru, kernel)[:days]
+    if dau.shape[0] < days:
+        dau = np.pad(dau, (0, days - dau.shape[0]))
+    
+    return dau.astype(np.int64)
+
+def calculate_revenue(dau: np.ndarray, pr: np.ndarray, arppu: np.ndarray) -> np.ndarray:
     """
     일별 매출 계산
     
@@ -781,37 +819,64 @@ def calculate_revenue(dau: List[float], pr: List[float], arppu: List[float]):
     주의: ARPPU는 '월간' 결제자당 평균 결제액이므로,
           일별 계산 시 30으로 나눠야 함
     """
-    revenue = []
-    for i in range(len(dau)):
-        pr_val = pr[i] if i < len(pr) else pr[-1]
-        arppu_val = arppu[i] if i < len(arppu) else arppu[-1]
-        
-        # ARPPU를 일별로 환산 (월간 ARPPU / 30)
-        daily_arppu = arppu_val / 30
-        
-        # 일별 매출 = DAU × PR × 일별 ARPPU
-        daily_revenue = dau[i] * pr_val * daily_arppu
-        revenue.append(daily_revenue)
+    dau_arr = np.asarray(dau, dtype=np.float64)
+    n = dau_arr.shape[0]
+    
+    # PR/ARPPU가 DAU보다 짧으면 마지막 값으로 채움
+    pr_arr = pad_to(pr, n)
+    arppu_arr = pad_to(arppu, n)
     
-    return revenue
+    # 일별 매출 = DAU × PR × 일별 ARPPU (월간 ARPPU / 30)
+    return dau_arr * pr_arr * (arppu_arr / 30)
 
 # OpenAI AI Integration
 CURRENT_MODEL = "gpt-4o"
 
+# AI 인사이트 응답 캐시 {프롬프트 해시: (저장 시각, 응답)}
+# 프롬프트는 요약 수치를 반올림해 넣으므로 같은 입력으로 다시 돌린 프로젝션은 같은 키가 됨
+AI_INSIGHT_CACHE_TTL = 3600  # 초
+AI_INSIGHT_CACHE_MAXSIZE = 1000
+_insight_cache: Dict[str, tuple] = {}
+
+def _insight_cache_key(prompt: str) -> str:
+    return hashlib.blake2b(f"{CURRENT_MODEL}\n{prompt}".encode("utf-8"), digest_size=16).hexdigest()
+
+# 일시적 오류(rate limit/서버 오류) 재시도 정책
+# 사용자가 기다리는 요청이라 요청 시간 + 백오프를 합친 전체 소요 시간을 AI_TOTAL_DEADLINE 이내로 제한
+AI_REQUEST_TIMEOUT = 60.0  # 초, 요청 1회 최대 시간
+AI_TOTAL_DEADLINE = 90.0  # 초, 모든 시도(요청 + 대기)를 합친 최대 시간
+AI_MAX_ATTEMPTS = 4
+AI_RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+AI_RETRY_BASE_DELAY = 2.0  # 초, 시도마다 2배
+AI_RETRY_MAX_DELAY = 8.0  # 초, Retry-After가 더 길어도 이 값으로 제한
+
+def _retry_delay(attempt: int, response: httpx.Response) -> float:
+    """재시도 대기 시간 (Retry-After 헤더 우선, 없으면 지수 백오프) + jitter"""
+    try:
+        delay = float(response.headers.get("retry-after"))
+    except (TypeError, ValueError):
+        delay = AI_RETRY_BASE_DELAY * 2 ** attempt
+    return min(delay, AI_RETRY_MAX_DELAY) + random.random()
+
 async def get_ai_insight(prompt: str) -> str:
     """Call OpenAI API for AI insights with Mock Fallback"""
     if not OPENAI_API_KEY:
         print("💡 API Key가 없습니다. Mock 데이터를 반환합니다.")
         return None
     
+    cache_key = _insight_cache_key(prompt)
+    cached = _insight_cache.get(cache_key)
+    if cached is not None and time.monotonic() - cached[0] < AI_INSIGHT_CACHE_TTL:
+        return cached[1]
+    
     try:
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
+        # lifespan에서 만든 공유 클라이언트 (커넥션 풀 재사용)
+        # 429/5xx는 백오프 후 재시도, 그 외 4xx는 바로 실패 처리
+        # 각 요청의 timeout은 전체 마감까지 남은 시간으로 줄임 (마감이 지나면 TimeoutException → Mock 전환)
+        deadline = time.monotonic() + AI_TOTAL_DEADLINE
+        for attempt in range(AI_MAX_ATTEMPTS):
+            response = await app.state.http.post(
                 OPENAI_API_URL,
-                headers={
-                    "Authorization": f"Bearer {OPENAI_API_KEY}",
-                    "Content-Type": "application/json"
-                },
                 json={
                     "model": CURRENT_MODEL,
                     "max_tokens": 2000,
@@ -819,14 +884,29 @@ async def get_ai_insight(prompt: str) -> str:
                         {"role": "system", "content": "You are a game industry expert analyst."},
                         {"role": "user", "content": prompt}
                     ]
-                }
+                },
+                timeout=min(AI_REQUEST_TIMEOUT, max(deadline - time.monotonic(), 0.0)),
             )
-            
-            response.raise_for_status()
-            
-            data = response.json()
-            return data["choices"][0]["message"]["content"]
-                
+            if response.status_code not in AI_RETRY_STATUS_CODES or attempt == AI_MAX_ATTEMPTS - 1:
+                break
+            delay = _retry_delay(attempt, response)
+            if time.monotonic() + delay >= deadline:
+                break  # 대기 후에는 재시도할 시간이 남지 않음 → 마지막 응답으로 실패 처리
+            print(f"⏳ API {response.status_code} 응답, {delay:.1f}초 후 재시도 ({attempt + 1}/{AI_MAX_ATTEMPTS - 1})")
+            await asyncio.sleep(delay)
+        
+        response.raise_for_status()
+        
+        data = response.json()
+        content = data["choices"][0]["message"]["content"]
+        
+        # 성공한 응답만 캐시 (가장 오래된 항목부터 제거)
+        _insight_cache.pop(cache_key, None)
+        _insight_cache[cache_key] = (time.monotonic(), content)
+        while len(_insight_cache) > AI_INSIGHT_CACHE_MAXSIZE:
+            _insight_cache.pop(next(iter(_insight_cache)))
+        return content
+        
     except httpx.HTTPStatusError as e:
         print(f"❌ API HTTP 에러: {e.response.status_code}")
         return None
@@ -938,7 +1018,7 @@ Normal 시나리오 기준 1년 예상 매출과 핵심 지표를 한 문장으
 UA&브랜딩 마케터, 퍼블리싱, 데이터 사이언스, 라이브 서비스 4명의 전문가 관점을 종합하여 다음 사항을 하나의 통합된 분석으로 작성:
 - 모객 효율 및 {'Organic 중심 마케팅 전략' if any(p in ['PC', 'Console'] for p in blending.get('platforms', ['PC'])) else 'UA 전략'}
 - {blending.get('genre', 'N/A')} 장르 시장 경쟁력 및 BM 구조 적합성
-- 리텐션 커브 건전성 및 Best-Worst 편차 ({((summary.get('best', {{}}).get('gross_revenue', 1) / max(summary.get('worst', {{}}).get('gross_revenue', 1), 1) - 1) * 100):.0f}%)
+- 리텐션 커브 건전성 및 Best-Worst 편차 ({((summary.get('best', {}).get('gross_revenue', 1) / max(summary.get('worst', {}).get('gross_revenue', 1), 1) - 1) * 100):.0f}%)
 - ROAS, 손익분기점, Sustaining 전략
 
 각 전문가의 의견을 나열하지 말고, 하나의 통합된 문단으로 자연스럽게 연결하여 작성하세요.
@@ -1079,12 +1159,190 @@ async def get_game_data(metric: str, game_name: str):
 async def get_default_config():
     return load_config()
 
-@app.post("/api/projection")
-async def calculate_projection(input_data: ProjectionInput):
-    raw_data = load_raw_data()
+def _run_scenario(scenario: str, ctx: Dict[str, Any]) -> tuple:
+    """
+    시나리오 1개(best/normal/worst)의 리텐션 → NRU → DAU → 매출 파이프라인
+    
+    공유 입력(ctx)은 읽기만 하고 새 배열만 만들어 반환하므로 시나리오끼리 스레드에서 동시에 실행 가능
+    
+    Returns:
+        (시나리오 결과 dict, V8.5 NRU 메타 - normal 시나리오 + UA 예산이 있을 때만, 그 외 None)
+    """
+    input_data = ctx["input_data"]
+    days = ctx["days"]
+    a, b = ctx["a"], ctx["b"]
+    base_ret_curve = ctx["base_ret_curve"]
+    pr_pattern = ctx["pr_pattern"]
+    arppu_pattern = ctx["arppu_pattern"]
+    benchmark = ctx["benchmark"]
+    benchmark_ret_curve = ctx["benchmark_ret_curve"]
+    seasonality_factors = ctx["seasonality_factors"]
+    base_weight = ctx["base_weight"]
+    quality_multiplier = ctx["quality_multiplier"]
+    use_benchmark_only = ctx["use_benchmark_only"]
+    use_time_decay = ctx["use_time_decay"]
+    nru_meta_out = None
+    
+    target_d1 = input_data.retention.target_d1_retention[scenario]
+    
+    # 내부 표본 기반 리텐션 커브 (공유 base 커브를 target_d1에 맞게 스케일만)
+    internal_ret_curve = scale_retention_curve(base_ret_curve, retention_curve(1, a, b), target_d1)
+    
+    # V7: Time-Decay 블렌딩 적용
+    if use_time_decay and not use_benchmark_only:
+        # 벤치마크 커브를 target_d1에 맞게 스케일링
+        benchmark_scale = target_d1 / benchmark["d1"] if benchmark["d1"] > 0 else 1.0
+        scaled_benchmark_curve = np.minimum(benchmark_ret_curve * benchmark_scale, 1.0)
+        ret_curve = calculate_time_decay_blended_retention(
+            internal_ret_curve, scaled_benchmark_curve, days, quality_multiplier
+        )
+    elif not use_benchmark_only:
+        # 기존 고정 블렌딩
+        benchmark_scale = target_d1 / benchmark["d1"] if benchmark["d1"] > 0 else 1.0
+        scaled_benchmark_curve = np.minimum(benchmark_ret_curve * benchmark_scale, 1.0)
+        ret_curve = calculate_blended_retention(internal_ret_curve, scaled_benchmark_curve, base_weight)
+    else:
+        # 벤치마크만 사용
+        benchmark_scale = target_d1 / benchmark["d1"] if benchmark["d1"] > 0 else 1.0
+        ret_curve = np.minimum(benchmark_ret_curve * benchmark_scale * quality_multiplier, 1.0)
+    
+    # V7: NRU 시리즈 생성 (런칭 마케팅 D1~D30 집중)
+    d1_nru = input_data.nru.d1_nru[scenario]
+    
+    # 시나리오별 NRU 보정
+    nru_adj = input_data.nru.adjustment.get("best_vs_normal", 0) if scenario == "best" else \
+              input_data.nru.adjustment.get("worst_vs_normal", 0) if scenario == "worst" else 0
+    adjusted_d1_nru = int(d1_nru * (1 + nru_adj))
+    
+    # V8.5: UA/Brand 분리 지원
+    ua_budget = input_data.nru.ua_budget or 0
+    brand_budget = input_data.nru.brand_budget or 0
+    target_cpa = input_data.nru.target_cpa or 2000
+    base_organic_ratio = input_data.nru.base_organic_ratio or 0.2
+    
+    # UA/Brand 예산이 설정되어 있으면 V8.5 로직 사용
+    if ua_budget > 0:
+        # 시나리오별 예산 조정
+        scenario_mult = 1.1 if scenario == "best" else (0.9 if scenario == "worst" else 1.0)
+        adj_ua = int(ua_budget * scenario_mult)
+        adj_brand = int(brand_budget * scenario_mult)
+        
+        sustaining_monthly = input_data.basic_settings.get("sustaining_mkt_budget_monthly", 0) if input_data.basic_settings else 0
+        
+        # V8.5+ 신규 파라미터
+        pre_marketing_ratio = input_data.nru.pre_marketing_ratio or 0.0
+        wishlist_conversion_rate = input_data.nru.wishlist_conversion_rate or 0.15
+        cpa_saturation_enabled = input_data.nru.cpa_saturation_enabled if input_data.nru.cpa_saturation_enabled is not None else True
+        brand_time_lag_enabled = input_data.nru.brand_time_lag_enabled if input_data.nru.brand_time_lag_enabled is not None else True
+        
+        nru_series, paid_nru, organic_nru, organic_boost, nru_meta = generate_nru_series_v85(
+            adj_ua, adj_brand, target_cpa, base_organic_ratio, days, 30, sustaining_monthly,
+            pre_marketing_ratio, wishlist_conversion_rate, cpa_saturation_enabled, brand_time_lag_enabled
+        )
+        
+        # 시나리오별 메타 정보 저장
+        if scenario == "normal":
+            nru_meta_out = {
+                "paid_nru": paid_nru,
+                "organic_nru": organic_nru,
+                "organic_boost_factor": round(organic_boost, 2),
+                "total_nru": paid_nru + organic_nru,
+                # V8.5+ 추가 메타
+                "effective_cpa": nru_meta["effective_cpa"],
+                "cpa_saturation_factor": nru_meta["cpa_saturation_factor"],
+                "pre_launch_users": nru_meta["pre_launch_users"],
+                "wishlist_users": nru_meta["wishlist_users"],
+                "d1_burst_users": nru_meta["d1_burst_users"],
+                "brand_time_lag_peak_day": nru_meta["brand_time_lag_peak_day"]
+            }
+    else:
+        # 기존 로직 (d1_nru 직접 입력)
+        nru_series = generate_nru_series(adjusted_d1_nru, [], days)
+    
+    # V7: 계절성 적용 (NRU에 반영, 두 생성기 모두 ndarray를 반환하므로 곱셈 + 정수 변환 한 번)
+    nru_series = (nru_series * seasonality_factors).astype(np.int64)
+    
+    # DAU 계산
+    dau_series = calculate_dau_matrix(nru_series, ret_curve, days)
     
+    # PR 보정
+    pr_adj = input_data.revenue.pr_adjustment.get("best_vs_normal", 0) if scenario == "best" else \
+             input_data.revenue.pr_adjustment.get("worst_vs_normal", 0) if scenario == "worst" else 0
+    
+    # PR 블렌딩 (BM Type 적용됨) + V7: Quality Score도 적용
+    if not use_benchmark_only:
+        weight_internal = base_weight
+        # 벤치마크 PR에 Quality Score 적용
+        adjusted_benchmark_pr = benchmark["pr"] * quality_multiplier
+        pr_series = calculate_blended_pr(pr_pattern, adjusted_benchmark_pr, weight_internal, days)
+    else:
+        # 벤치마크만 사용 시에도 Quality Score 적용
+        pr_series = np.full(days, benchmark["pr"] * quality_multiplier)
+    pr_series *= (1 + pr_adj)  # 블렌딩 결과는 새 배열이므로 제자리 보정
+    
+    # ARPPU 보정
+    arppu_adj = input_data.revenue.arppu_adjustment.get("best_vs_normal", 0) if scenario == "best" else \
+                input_data.revenue.arppu_adjustment.get("worst_vs_normal", 0) if scenario == "worst" else 0
+    
+    # ARPPU 블렌딩 (BM Type 적용됨) + V7: Quality Score도 적용
+    if not use_benchmark_only:
+        # 벤치마크 ARPPU에 Quality Score 적용
+        adjusted_benchmark_arppu = benchmark["arppu"] * quality_multiplier
+        arppu_series = calculate_blended_arppu(arppu_pattern, adjusted_benchmark_arppu, base_weight, days)
+    else:
+        # 벤치마크만 사용 시에도 Quality Score 적용
+        arppu_series = np.full(days, benchmark["arppu"] * quality_multiplier)
+    # 보정 + V7 계절성을 같은 버퍼에 제자리로 반영 (중간 배열 생성 없음)
+    arppu_series *= (1 + arppu_adj)
+    arppu_series *= seasonality_factors
+    
+    # Revenue 계산 (일별 ARPPU 환산 적용됨)
+    revenue_series = calculate_revenue(dau_series, pr_series, arppu_series)
+    
+    result = {
+        "retention": {
+            "coefficients": {"a": float(a), "b": float(b)},
+            "target_d1": target_d1,
+            "curve": ret_curve[:90]
+        },
+        "nru": {
+            "d1_nru": d1_nru,
+            "series": nru_series[:90],
+            "total": int(nru_series.sum()),
+            "paid": paid_nru if ua_budget > 0 else int(nru_series.sum()),
+            "organic": organic_nru if ua_budget > 0 else 0
+        },
+        "dau": {
+            "series": dau_series[:90],
+            "peak": int(dau_series.max()),
+            "average": int(np.mean(dau_series))
+        },
+        "revenue": {
+            "pr_series": pr_series[:90],
+            "arppu_series": arppu_series[:90],
+            "daily_revenue": revenue_series[:90],
+            "total_gross": float(revenue_series.sum()),
+            "average_daily": float(np.mean(revenue_series))
+        },
+        "full_data": {
+            "nru": nru_series,
+            "dau": dau_series,
+            "revenue": revenue_series,
+            "retention": ret_curve,
+            "pr": pr_series,
+            "arppu": arppu_series
+        }
+    }
+    
+    return result, nru_meta_out
+
+def _prepare_projection(input_data: ProjectionInput) -> Dict[str, Any]:
+    """
+    시나리오 공통 입력 준비 (블렌딩 설정, 계절성, 벤치마크, 표본 게임 계수/패턴)
+    
+    캐시 미스 시 curve_fit 회귀와 raw data 로드가 포함된 동기 연산이므로 threadpool에서 호출
+    """
     days = input_data.projection_days
-    results = {"best": {}, "normal": {}, "worst": {}}
     
     # ============================================
     # V7: 블렌딩 설정 추출
@@ -1104,7 +1362,7 @@ async def calculate_projection(input_data: ProjectionInput):
     
     # V7: 계절성 팩터
     regions = input_data.regions or ["global"]
-    seasonality_factors = calculate_seasonality(regions, input_data.launch_date, days)
+    seasonality_factors = seasonality_array(tuple(regions), input_data.launch_date, days)  # 캐시된 읽기 전용 배열
     
     # 표본 게임이 없으면 벤치마크 100% 사용
     has_sample_games = len(input_data.retention.selected_games) > 0
@@ -1112,170 +1370,75 @@ async def calculate_projection(input_data: ProjectionInput):
         base_weight = 0.0
         use_benchmark_only = True
     
-    # 벤치마크 데이터 가져오기 (BM Type 적용)
-    benchmark = get_benchmark_data(genre, platforms)
-    benchmark["pr"] = benchmark["pr"] * bm_modifier["pr_mod"]
-    benchmark["arppu"] = benchmark["arppu"] * bm_modifier["arppu_mod"]
-    benchmark_ret_curve = generate_benchmark_retention_curve(benchmark, days)
+    # 벤치마크 데이터 가져오기 (BM Type 적용, 장르/플랫폼/BM/기간 단위로 캐시)
+    benchmark_items, benchmark_ret_curve = _build_benchmark(genre, tuple(platforms), bm_type, days)
+    benchmark = dict(benchmark_items)
     
     # 내부 표본 기반 계수 계산
-    a, b = calculate_retention_coefficients(input_data.retention.selected_games, raw_data)
-    pr_pattern = calculate_pr_pattern(input_data.revenue.selected_games_pr, raw_data)
-    arppu_pattern = calculate_arppu_pattern(input_data.revenue.selected_games_arppu, raw_data)
+    # (raw data가 바뀌지 않았다면 같은 게임 조합은 캐시에서 바로 반환, raw data는 캐시 미스 때만 로드)
+    version = raw_data_version()
+    a, b = cached_retention_coefficients(tuple(sorted(input_data.retention.selected_games)), version)
+    # PR/ARPPU 패턴은 여기서 한 번만 days 길이로 맞춰 두면 이후 블렌딩/매출 계산의 pad_to는 뷰만 반환
+    pr_pattern = pad_to(cached_pr_pattern(tuple(sorted(input_data.revenue.selected_games_pr)), version), days)
+    arppu_pattern = pad_to(cached_arppu_pattern(tuple(sorted(input_data.revenue.selected_games_arppu)), version), days)
+    
+    # 시나리오 계산과 응답 조립에 쓰는 공유 입력 (시나리오 쪽에서는 읽기만 함)
+    return {
+        "input_data": input_data,
+        "days": days,
+        "a": a,
+        "b": b,
+        # 시나리오 간에는 target_d1만 다르므로 Power Law 커브는 한 번만 계산
+        "base_ret_curve": base_retention_curve(a, b, days),
+        "pr_pattern": pr_pattern,
+        "arppu_pattern": arppu_pattern,
+        "benchmark": benchmark,
+        "benchmark_ret_curve": benchmark_ret_curve,
+        "seasonality_factors": seasonality_factors,
+        "base_weight": base_weight,
+        "quality_multiplier": quality_multiplier,
+        "use_benchmark_only": use_benchmark_only,
+        "use_time_decay": use_time_decay,
+        "genre": genre,
+        "platforms": platforms,
+        "quality_grade": quality_grade,
+        "bm_type": bm_type,
+        "bm_modifier": bm_modifier,
+        "regions": regions,
+    }
+
+@app.post("/api/projection", response_class=ORJSONResponse)
+async def calculate_projection(input_data: ProjectionInput, include_full: bool = True):
+    """
+    KPI 프로젝션 계산
     
-    for scenario in ["best", "normal", "worst"]:
-        target_d1 = input_data.retention.target_d1_retention[scenario]
-        
-        # 내부 표본 기반 리텐션 커브
-        internal_ret_curve = generate_retention_curve(a, b, target_d1, days)
-        
-        # V7: Time-Decay 블렌딩 적용
-        if use_time_decay and not use_benchmark_only:
-            # 벤치마크 커브를 target_d1에 맞게 스케일링
-            benchmark_scale = target_d1 / benchmark["d1"] if benchmark["d1"] > 0 else 1.0
-            scaled_benchmark_curve = [min(r * benchmark_scale, 1.0) for r in benchmark_ret_curve]
-            ret_curve = calculate_time_decay_blended_retention(
-                internal_ret_curve, scaled_benchmark_curve, days, quality_multiplier
-            )
-        elif not use_benchmark_only:
-            # 기존 고정 블렌딩
-            benchmark_scale = target_d1 / benchmark["d1"] if benchmark["d1"] > 0 else 1.0
-            scaled_benchmark_curve = [min(r * benchmark_scale, 1.0) for r in benchmark_ret_curve]
-            ret_curve = calculate_blended_retention(internal_ret_curve, scaled_benchmark_curve, base_weight)
-        else:
-            # 벤치마크만 사용
-            benchmark_scale = target_d1 / benchmark["d1"] if benchmark["d1"] > 0 else 1.0
-            ret_curve = [min(r * benchmark_scale * quality_multiplier, 1.0) for r in benchmark_ret_curve]
-        
-        # V7: NRU 시리즈 생성 (런칭 마케팅 D1~D30 집중)
-        d1_nru = input_data.nru.d1_nru[scenario]
-        
-        # 시나리오별 NRU 보정
-        nru_adj = input_data.nru.adjustment.get("best_vs_normal", 0) if scenario == "best" else \
-                  input_data.nru.adjustment.get("worst_vs_normal", 0) if scenario == "worst" else 0
-        adjusted_d1_nru = int(d1_nru * (1 + nru_adj))
-        
-        # V8.5: UA/Brand 분리 지원
-        ua_budget = input_data.nru.ua_budget or 0
-        brand_budget = input_data.nru.brand_budget or 0
-        target_cpa = input_data.nru.target_cpa or 2000
-        base_organic_ratio = input_data.nru.base_organic_ratio or 0.2
-        
-        # UA/Brand 예산이 설정되어 있으면 V8.5 로직 사용
-        if ua_budget > 0:
-            # 시나리오별 예산 조정
-            scenario_mult = 1.1 if scenario == "best" else (0.9 if scenario == "worst" else 1.0)
-            adj_ua = int(ua_budget * scenario_mult)
-            adj_brand = int(brand_budget * scenario_mult)
-            
-            sustaining_monthly = input_data.basic_settings.get("sustaining_mkt_budget_monthly", 0) if input_data.basic_settings else 0
-            
-            # V8.5+ 신규 파라미터
-            pre_marketing_ratio = input_data.nru.pre_marketing_ratio or 0.0
-            wishlist_conversion_rate = input_data.nru.wishlist_conversion_rate or 0.15
-            cpa_saturation_enabled = input_data.nru.cpa_saturation_enabled if input_data.nru.cpa_saturation_enabled is not None else True
-            brand_time_lag_enabled = input_data.nru.brand_time_lag_enabled if input_data.nru.brand_time_lag_enabled is not None else True
-            
-            nru_series, paid_nru, organic_nru, organic_boost, nru_meta = generate_nru_series_v85(
-                adj_ua, adj_brand, target_cpa, base_organic_ratio, days, 30, sustaining_monthly,
-                pre_marketing_ratio, wishlist_conversion_rate, cpa_saturation_enabled, brand_time_lag_enabled
-            )
-            
-            # 시나리오별 메타 정보 저장
-            if scenario == "normal":
-                v85_nru_meta = {
-                    "paid_nru": paid_nru,
-                    "organic_nru": organic_nru,
-                    "organic_boost_factor": round(organic_boost, 2),
-                    "total_nru": paid_nru + organic_nru,
-                    # V8.5+ 추가 메타
-                    "effective_cpa": nru_meta["effective_cpa"],
-                    "cpa_saturation_factor": nru_meta["cpa_saturation_factor"],
-                    "pre_launch_users": nru_meta["pre_launch_users"],
-                    "wishlist_users": nru_meta["wishlist_users"],
-                    "d1_burst_users": nru_meta["d1_burst_users"],
-                    "brand_time_lag_peak_day": nru_meta["brand_time_lag_peak_day"]
-                }
-        else:
-            # 기존 로직 (d1_nru 직접 입력)
-            nru_series = generate_nru_series(adjusted_d1_nru, [], days)
-            v85_nru_meta = None
-        
-        # V7: 계절성 적용 (NRU에 반영)
-        nru_series = [int(nru * sf) for nru, sf in zip(nru_series, seasonality_factors)]
-        
-        # DAU 계산
-        dau_series = calculate_dau_matrix(nru_series, ret_curve, days)
-        
-        # PR 보정
-        pr_adj = input_data.revenue.pr_adjustment.get("best_vs_normal", 0) if scenario == "best" else \
-                 input_data.revenue.pr_adjustment.get("worst_vs_normal", 0) if scenario == "worst" else 0
-        
-        # PR 블렌딩 (BM Type 적용됨) + V7: Quality Score도 적용
-        if not use_benchmark_only:
-            weight_internal = base_weight
-            # 벤치마크 PR에 Quality Score 적용
-            adjusted_benchmark_pr = benchmark["pr"] * quality_multiplier
-            pr_series = calculate_blended_pr(pr_pattern, adjusted_benchmark_pr, weight_internal, days)
-        else:
-            # 벤치마크만 사용 시에도 Quality Score 적용
-            pr_series = [benchmark["pr"] * quality_multiplier] * days
-        pr_series = [p * (1 + pr_adj) for p in pr_series]
-        
-        # ARPPU 보정
-        arppu_adj = input_data.revenue.arppu_adjustment.get("best_vs_normal", 0) if scenario == "best" else \
-                    input_data.revenue.arppu_adjustment.get("worst_vs_normal", 0) if scenario == "worst" else 0
-        
-        # ARPPU 블렌딩 (BM Type 적용됨) + V7: Quality Score도 적용
-        if not use_benchmark_only:
-            # 벤치마크 ARPPU에 Quality Score 적용
-            adjusted_benchmark_arppu = benchmark["arppu"] * quality_multiplier
-            arppu_series = calculate_blended_arppu(arppu_pattern, adjusted_benchmark_arppu, base_weight, days)
-        else:
-            # 벤치마크만 사용 시에도 Quality Score 적용
-            arppu_series = [benchmark["arppu"] * quality_multiplier] * days
-        arppu_series = [a * (1 + arppu_adj) for a in arppu_series]
-        
-        # V7: 계절성을 ARPPU에도 반영
-        arppu_series = [arppu * sf for arppu, sf in zip(arppu_series, seasonality_factors)]
-        
-        # Revenue 계산 (일별 ARPPU 환산 적용됨)
-        revenue_series = calculate_revenue(dau_series, pr_series, arppu_series)
-        
-        results[scenario] = {
-            "retention": {
-                "coefficients": {"a": float(a), "b": float(b)},
-                "target_d1": target_d1,
-                "curve": ret_curve[:90]
-            },
-            "nru": {
-                "d1_nru": d1_nru,
-                "series": nru_series[:90],
-                "total": sum(nru_series),
-                "paid": paid_nru if ua_budget > 0 else sum(nru_series),
-                "organic": organic_nru if ua_budget > 0 else 0
-            },
-            "dau": {
-                "series": dau_series[:90],
-                "peak": int(max(dau_series)),
-                "average": int(np.mean(dau_series))
-            },
-            "revenue": {
-                "pr_series": pr_series[:90],
-                "arppu_series": arppu_series[:90],
-                "daily_revenue": revenue_series[:90],
-                "total_gross": sum(revenue_series),
-                "average_daily": float(np.mean(revenue_series))
-            },
-            "full_data": {
-                "nru": nru_series,
-                "dau": dau_series,
-                "revenue": revenue_series,
-                "retention": ret_curve,
-                "pr": pr_series,
-                "arppu": arppu_series
-            }
-        }
+    include_full: false면 시나리오별 전체 기간 시계열(full_data)을 생략
+                  (90일 시계열 + 요약만 필요한 호출 측에서 직렬화/전송량을 줄이는 용도)
+    """
+    # 공통 입력 준비(회귀/패턴/계절성)는 동기 연산이므로 threadpool에서 실행해 이벤트 루프를 막지 않음
+    ctx = await run_in_threadpool(_prepare_projection, input_data)
+    days = ctx["days"]
+    base_weight = ctx["base_weight"]
+    use_benchmark_only = ctx["use_benchmark_only"]
+    use_time_decay = ctx["use_time_decay"]
+    benchmark = ctx["benchmark"]
+    genre, platforms, regions = ctx["genre"], ctx["platforms"], ctx["regions"]
+    quality_grade, quality_multiplier = ctx["quality_grade"], ctx["quality_multiplier"]
+    bm_type, bm_modifier = ctx["bm_type"], ctx["bm_modifier"]
+    
+    results = {"best": {}, "normal": {}, "worst": {}}
+    v85_nru_meta = None  # V8.5: Normal 시나리오의 UA/Brand NRU 메타 (UA 예산이 있을 때만 설정)
+    
+    # 시나리오 3개는 서로 독립 → threadpool에서 동시에 실행 (NumPy 연산 중에는 GIL 해제)
+    # _prepare_projection과 같은 Starlette threadpool을 사용해 동시 스레드 수를 한 곳에서 제한
+    scenarios = ["best", "normal", "worst"]
+    scenario_outputs = await asyncio.gather(*[run_in_threadpool(_run_scenario, s, ctx) for s in scenarios])
+    for scenario, (scenario_result, nru_meta) in zip(scenarios, scenario_outputs):
+        if not include_full:
+            del scenario_result["full_data"]
+        results[scenario] = scenario_result
+        if nru_meta is not None:
+            v85_nru_meta = nru_meta
     
     # Calculate summary
     summary = {}
@@ -1347,10 +1510,11 @@ async def calculate_projection(input_data: ProjectionInput):
             "cpa_saturation_enabled": input_data.nru.cpa_saturation_enabled if input_data.nru.cpa_saturation_enabled is not None else True,
             "brand_time_lag_enabled": input_data.nru.brand_time_lag_enabled if input_data.nru.brand_time_lag_enabled is not None else True
         },
-        "nru_analysis": v85_nru_meta if 'v85_nru_meta' in dir() and v85_nru_meta else None
+        "nru_analysis": v85_nru_meta
     }
     
-    return {
+    # jsonable_encoder를 거치지 않고 orjson으로 바로 직렬화
+    return ORJSONResponse({
         "status": "success",
         "input": {
             "launch_date": input_data.launch_date,
@@ -1380,20 +1544,12 @@ async def calculate_projection(input_data: ProjectionInput):
         "v85_marketing": v85_marketing_analysis,  # V8.5: 마케팅 분석 추가
         "summary": summary,
         "results": results
-    }
+    })
 
 # V9.8: Mock AI Report Generator (Fallback용)
-def generate_mock_ai_report(summary: Dict[str, Any], analysis_type: str) -> str:
-    """API 실패 시 사용할 Mock 보고서 생성"""
-    genre = summary.get('blending', {}).get('genre', 'N/A')
-    platforms = ', '.join(summary.get('blending', {}).get('platforms', ['PC']))
-    normal_revenue = summary.get('normal', {}).get('gross_revenue', 0)
-    bep_day = summary.get('bep_day', -1)
-    
-    bep_status = f"D+{bep_day}에 BEP 달성 예상" if bep_day > 0 else "1년 내 BEP 미달성 위험"
-    
-    if analysis_type == "executive_report":
-        return f"""[종합 분석 요약]
+# 분석 유형별 템플릿 (str.format_map으로 채움)
+MOCK_REPORT_TEMPLATES = {
+    "executive_report": """[종합 분석 요약]
 {genre} 장르의 {platforms} 플랫폼 프로젝트입니다. 
 Normal 시나리오 기준 총 매출 {normal_revenue:,.0f}원이 예상됩니다.
 {bep_status}입니다.
@@ -1413,32 +1569,65 @@ Normal 시나리오 기준 총 매출 {normal_revenue:,.0f}원이 예상됩니
 2. D1 리텐션 확보를 위한 온보딩 최적화
 3. 라이브 서비스 준비로 장기 운영 대비
 
-* 이 보고서는 AI 연결 실패로 인한 기본 분석입니다."""
-    else:
-        return f"[{analysis_type}] {genre} 프로젝트 분석 결과입니다. 상세 AI 분석을 위해 API 연결을 확인해주세요."
+* 이 보고서는 AI 연결 실패로 인한 기본 분석입니다.""",
+}
+MOCK_REPORT_DEFAULT_TEMPLATE = "[{analysis_type}] {genre} 프로젝트 분석 결과입니다. 상세 AI 분석을 위해 API 연결을 확인해주세요."
 
-# AI Insight Endpoint
-@app.post("/api/ai/insight")
-async def get_ai_insight_endpoint(request: AIInsightRequest):
-    """Get AI-powered insights for projection results with Mock Fallback"""
-    prompt = create_insight_prompt(request.projection_summary, request.analysis_type)
+def generate_mock_ai_report(summary: Dict[str, Any], analysis_type: str) -> str:
+    """API 실패 시 사용할 Mock 보고서 생성"""
+    blending = summary.get('blending', {})
+    bep_day = summary.get('bep_day', -1)
+    
+    template = MOCK_REPORT_TEMPLATES.get(analysis_type, MOCK_REPORT_DEFAULT_TEMPLATE)
+    return template.format_map({
+        "analysis_type": analysis_type,
+        "genre": blending.get('genre', 'N/A'),
+        "platforms": ', '.join(blending.get('platforms', ['PC'])),
+        "normal_revenue": summary.get('normal', {}).get('gross_revenue', 0),
+        "bep_status": f"D+{bep_day}에 BEP 달성 예상" if bep_day > 0 else "1년 내 BEP 미달성 위험",
+    })
+
+# 배치 요청 시 동시에 보내는 AI 호출 수 상한 (API rate limit 보호)
+AI_BATCH_CONCURRENCY = 5
+
+async def _insight_with_fallback(summary: Dict[str, Any], analysis_type: str) -> dict:
+    """분석 유형 1개의 AI 인사이트 (실패 시 Mock 보고서)"""
+    prompt = create_insight_prompt(summary, analysis_type)
     insight = await get_ai_insight(prompt)
     
     # V9.8: Mock Fallback
     if insight is None:
         print("⚠️ AI API failed. Using Mock Report.")
-        insight = generate_mock_ai_report(request.projection_summary, request.analysis_type)
+        insight = generate_mock_ai_report(summary, analysis_type)
         ai_model = "mock-fallback"
     else:
         ai_model = CURRENT_MODEL
     
     return {
-        "status": "success",
-        "analysis_type": request.analysis_type,
+        "analysis_type": analysis_type,
         "insight": insight,
         "ai_model": ai_model
     }
 
+# AI Insight Endpoint
+@app.post("/api/ai/insight")
+async def get_ai_insight_endpoint(request: AIInsightRequest):
+    """Get AI-powered insights for projection results with Mock Fallback"""
+    result = await _insight_with_fallback(request.projection_summary, request.analysis_type)
+    return {"status": "success", **result}
+
+@app.post("/api/ai/insights/batch")
+async def get_ai_insights_batch(request: BatchAIInsightRequest):
+    """여러 분석 유형의 AI 인사이트를 한 번에 요청 (유형별 호출을 동시에 실행, 동시 호출 수는 제한)"""
+    semaphore = asyncio.Semaphore(AI_BATCH_CONCURRENCY)
+    
+    async def run_one(analysis_type: str) -> dict:
+        async with semaphore:
+            return await _insight_with_fallback(request.projection_summary, analysis_type)
+    
+    insights = await asyncio.gather(*(run_one(t) for t in request.analysis_types))
+    return {"status": "success", "insights": list(insights)}
+
 @app.get("/api/ai/status")
 async def get_ai_status():
     """Check AI integration status"""
@@ -1450,123 +1639,136 @@ async def get_ai_status():
 
 @app.get("/api/raw-data")
 async def get_raw_data():
-    return load_raw_data()
+    # 수 MB dict를 jsonable_encoder로 순회하지 않고 orjson으로 바로 직렬화
+    return ORJSONResponse(load_raw_data())
 
-@app.get("/api/raw-data/download")
-async def download_raw_data_excel():
-    """Download raw game data as Excel file (same format as original)"""
-    import io
-    from openpyxl import Workbook
-    from openpyxl.styles import Font, PatternFill, Border, Side, Alignment
-    from fastapi.responses import StreamingResponse
+def _build_raw_data_workbook(raw_data: dict):
+    """raw data를 원본 엑셀 형식의 xlsx로 기록한 버퍼 반환 (동기 작업, threadpool에서 호출)"""
+    import xlsxwriter
     
-    raw_data = load_raw_data()
-    wb = Workbook()
-    
-    # 스타일 정의
-    header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-    header_font = Font(color="FFFFFF", bold=True)
-    thin_border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
+    # 8MB까지는 메모리, 넘으면 임시 파일로 넘어가는 버퍼 (BytesIO에 통째로 쌓지 않음)
+    output = tempfile.SpooledTemporaryFile(max_size=EXCEL_SPOOL_MAX_SIZE)
+    # constant_memory: 행을 쓰는 즉시 디스크로 내보내 시트 전체를 셀 객체로 들고 있지 않음
+    wb = xlsxwriter.Workbook(output, {'constant_memory': True, 'nan_inf_to_errors': True})
+    
+    # 스타일 정의 (Format 객체는 한 번만 만들어 모든 셀에서 공유)
+    header_format = wb.add_format({'bg_color': '#4472C4', 'font_color': '#FFFFFF', 'bold': True, 'border': 1})
+    cell_format = wb.add_format({'border': 1})
+    percent_format = wb.add_format({'border': 1, 'num_format': '0.00%'})
+    notice_format = wb.add_format({'font_color': '#FF0000'})
+    bold_format = wb.add_format({'bold': True})
     
     def create_raw_sheet(ws, sheet_title, metric_name, description, data_dict):
-        """Raw 데이터 시트 생성 (원본 엑셀 형식)"""
+        """Raw 데이터 시트 생성 (원본 엑셀 형식, constant_memory 모드라 위에서 아래로 행 순서대로 기록)"""
         # Row 1: 안내 문구
-        ws['B1'] = f'- 아래 게임 추가 시 {sheet_title} 게임 리스트에 자동으로 추가됩니다.'
-        ws['B1'].font = Font(color="FF0000")
+        ws.write_string('B1', f'- 아래 게임 추가 시 {sheet_title} 게임 리스트에 자동으로 추가됩니다.', notice_format)
         
         # Row 2: 메트릭명 및 설명
-        ws['B2'] = metric_name
-        ws['B2'].font = Font(bold=True)
-        ws['C2'] = description
+        ws.write_string('B2', metric_name, bold_format)
+        ws.write_string('C2', description)
         
         # Row 3: 헤더 (게임명, 1, 2, 3, ... 365)
-        ws['B3'] = '게임명'
-        ws['B3'].fill = header_fill
-        ws['B3'].font = header_font
-        ws['B3'].border = thin_border
-        
         max_days = 90 if metric_name == '리텐션' else 365
-        for day in range(1, max_days + 1):
-            col = day + 2  # C부터 시작
-            cell = ws.cell(row=3, column=col, value=day)
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.border = thin_border
+        ws.write_string(2, 1, '게임명', header_format)
+        ws.write_row(2, 2, range(1, max_days + 1), header_format)  # C부터 시작
         
-        # Row 4+: 게임 데이터
-        row_idx = 4
-        for game_name, values in data_dict.items():
-            ws.cell(row=row_idx, column=2, value=game_name).border = thin_border
-            for i, val in enumerate(values[:max_days]):
-                cell = ws.cell(row=row_idx, column=i + 3, value=val)
-                cell.border = thin_border
-                if metric_name in ['리텐션', 'PR']:
-                    cell.number_format = '0.00%'
-            row_idx += 1
+        # Row 4+: 게임 데이터 (행 단위로 한 번에 기록)
+        value_format = percent_format if metric_name in ['리텐션', 'PR'] else cell_format
+        for row_idx, (game_name, values) in enumerate(data_dict.items(), start=3):
+            ws.write_string(row_idx, 1, str(game_name), cell_format)
+            ws.write_row(row_idx, 2, values[:max_days], value_format)
         
         # 열 너비 조정
-        ws.column_dimensions['B'].width = 20
-        for col in range(3, max_days + 3):
-            ws.column_dimensions[ws.cell(row=3, column=col).column_letter].width = 8
+        ws.set_column(1, 1, 20)
+        ws.set_column(2, max_days + 1, 8)
     
     # Raw_Retention 시트
-    ws_retention = wb.active
-    ws_retention.title = "Raw_Retention"
-    create_raw_sheet(ws_retention, "1. Retention", "리텐션", "론칭 ~ 90일까지의 리텐션 정보 입력", raw_data['games'].get('retention', {}))
+    create_raw_sheet(wb.add_worksheet("Raw_Retention"), "1. Retention", "리텐션", "론칭 ~ 90일까지의 리텐션 정보 입력", raw_data['games'].get('retention', {}))
     
     # Raw_NRU 시트
-    ws_nru = wb.create_sheet("Raw_NRU")
-    create_raw_sheet(ws_nru, "2. NRU", "NRU", "론칭 ~ 365일까지의 데이터 입력", raw_data['games'].get('nru', {}))
+    create_raw_sheet(wb.add_worksheet("Raw_NRU"), "2. NRU", "NRU", "론칭 ~ 365일까지의 데이터 입력", raw_data['games'].get('nru', {}))
     
     # Raw_PR 시트
-    ws_pr = wb.create_sheet("Raw_PR")
-    create_raw_sheet(ws_pr, "3. Revenue", "PR", "론칭 ~ 365일까지의 데이터 입력", raw_data['games'].get('payment_rate', {}))
+    create_raw_sheet(wb.add_worksheet("Raw_PR"), "3. Revenue", "PR", "론칭 ~ 365일까지의 데이터 입력", raw_data['games'].get('payment_rate', {}))
     
     # Raw_ARPPU 시트
-    ws_arppu = wb.create_sheet("Raw_ARPPU")
-    create_raw_sheet(ws_arppu, "3. Revenue", "ARPPU", "론칭 ~ 365일까지의 데이터 입력", raw_data['games'].get('arppu', {}))
+    create_raw_sheet(wb.add_worksheet("Raw_ARPPU"), "3. Revenue", "ARPPU", "론칭 ~ 365일까지의 데이터 입력", raw_data['games'].get('arppu', {}))
     
-    # 메모리에 저장
-    output = io.BytesIO()
-    wb.save(output)
+    wb.close()
     output.seek(0)
+    return output
+
+@app.get("/api/raw-data/download")
+async def download_raw_data_excel():
+    """Download raw game data as Excel file (same format as original)"""
+    from fastapi.responses import StreamingResponse
+    
+    # 수천 행 워크북 생성이 이벤트 루프를 막지 않도록 threadpool에서 실행
+    output = await run_in_threadpool(_build_raw_data_workbook, load_raw_data())
+    
+    def iter_chunks():
+        """완성된 xlsx를 고정 크기 청크로 내보내고 전송이 끝나면 버퍼 정리"""
+        try:
+            while chunk := output.read(EXCEL_STREAM_CHUNK_SIZE):
+                yield chunk
+        finally:
+            output.close()
     
     return StreamingResponse(
-        output,
+        iter_chunks(),
         media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         headers={"Content-Disposition": "attachment; filename=raw_game_data.xlsx"}
     )
 
+def _merge_csv_upload(csv_file, metric: str) -> dict:
+    """업로드 CSV를 파싱해 raw data에 병합한 새 dict 반환 (동기 작업, threadpool에서 호출)"""
+    import pandas as pd
+    
+    # 캐시된 dict는 공유되므로 수정할 metric 테이블과 metadata만 얕은 복사
+    cached_raw_data = load_raw_data()
+    raw_data = {
+        **cached_raw_data,
+        "games": {**cached_raw_data['games']},
+        "metadata": {**cached_raw_data['metadata']},
+    }
+    if metric in raw_data['games']:
+        raw_data['games'][metric] = dict(raw_data['games'][metric])
+    
+    # 업로드 파일 객체를 청크 단위로 C 파서에 바로 전달 (전체를 bytes로 읽어 복사하지 않음), 게임명 컬럼은 문자열 고정
+    reader = pd.read_csv(csv_file, engine='c', dtype={0: str}, na_values=[''], chunksize=CSV_UPLOAD_CHUNK_ROWS)
+    for chunk in reader:
+        if metric not in raw_data['games']:
+            continue
+        # 게임명이 빈 행은 건너뜀 (NaN 키가 되어 JSON 저장이 실패하지 않도록)
+        chunk = chunk[chunk.iloc[:, 0].notna()]
+        # 값 컬럼은 청크 단위로 float64 배열 변환, 행별로 결측값만 제외
+        game_names = chunk.iloc[:, 0].tolist()
+        values_matrix = chunk.iloc[:, 1:].to_numpy(dtype=np.float64)
+        for game_name, row_values in zip(game_names, values_matrix):
+            raw_data['games'][metric][game_name] = row_values[~np.isnan(row_values)].tolist()
+    
+    raw_data['metadata'][f'{metric}_games'] = list(raw_data['games'][metric].keys())
+    
+    return raw_data
+
 @app.post("/api/raw-data/upload")
 async def upload_game_data(file: UploadFile = File(...), metric: str = "retention"):
     if not file.filename.endswith('.csv'):
         raise HTTPException(status_code=400, detail="Only CSV files are supported")
     
-    import pandas as pd
-    from io import StringIO
-    
-    content = await file.read()
-    df = pd.read_csv(StringIO(content.decode('utf-8')))
+    # CSV 파싱/병합은 동기 pandas 작업이므로 threadpool에서 실행 (업로드 임시 파일을 그대로 전달)
+    await file.seek(0)
+    raw_data = await run_in_threadpool(_merge_csv_upload, file.file, metric)
     
-    raw_data = load_raw_data()
-    
-    for _, row in df.iterrows():
-        game_name = row.iloc[0]
-        values = row.iloc[1:].tolist()
-        values = [float(v) for v in values if pd.notna(v)]
-        
-        if metric in raw_data['games']:
-            raw_data['games'][metric][game_name] = values
+    # 수 MB 파일 쓰기가 이벤트 루프를 막지 않도록 스레드에서 실행
+    await asyncio.to_thread(_atomic_write, RAW_DATA_PATH, orjson.dumps(raw_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
     
-    raw_data['metadata'][f'{metric}_games'] = list(raw_data['games'][metric].keys())
+    # 방금 쓴 내용으로 JSON 캐시 갱신 (다시 파싱하지 않음)
+    _json_cache[RAW_DATA_PATH] = (RAW_DATA_PATH.stat().st_mtime_ns, raw_data)
     
-    with open(RAW_DATA_PATH, 'w', encoding='utf-8') as f:
-        json.dump(raw_data, f, ensure_ascii=False, indent=2)
+    # 표본 게임 기반 계산 캐시 무효화 (mtime 해상도와 무관하게 확실히 갱신)
+    global RAW_DATA_VERSION
+    RAW_DATA_VERSION += 1
     
     return {"status": "success", "message": f"Added/updated games in {metric}"}
 
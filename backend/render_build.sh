@@ -1,2 +1,5 @@
 #!/bin/bash
 pip install -r requirements.txt
+
+# 수치 커널 AOT 컴파일 (mypyc) - 실패해도 순수 Python 모듈로 동작하므로 빌드는 계속 진행
+pip install mypy && mypyc _kernels.py || echo "⚠️ mypyc 컴파일 실패: _kernels.py를 순수 Python으로 사용합니다."
@@ -1,100 +1,224 @@
+import numpy as np
 import pandas as pd
-from openpyxl import load_workbook
-import json
-import warnings
-warnings.filterwarnings('ignore')
+import argparse
+import orjson
+import os
+import pickle
+import posixpath
+import sqlite3
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from pathlib import Path
+import xml.etree.ElementTree as ET
 
 file_path = "/mnt/user-data/uploads/프로젝트_희귀분석___.xlsm"
+output_path = Path('/home/claude/game-kpi-projection/data/raw_game_data.json')
 
-# 1. Raw_Retention 데이터 추출
-print("Extracting Raw_Retention...")
-wb = load_workbook(file_path, data_only=True)
-ws = wb['Raw_Retention']
-
-retention_data = {}
-for row in range(4, 27):  # 게임 데이터 행
-    game_name = ws.cell(row=row, column=2).value
-    if game_name and game_name != '게임명' and not str(game_name).startswith('-'):
-        retention_values = []
-        for col in range(3, 95):  # D+1 ~ D+90
-            val = ws.cell(row=row, column=col).value
-            if val is not None and isinstance(val, (int, float)) and val < 1:  # 리텐션은 1 미만
-                retention_values.append(round(float(val), 6))
-            else:
-                break
-        if retention_values:
-            retention_data[game_name] = retention_values
-
-print(f"  - {len(retention_data)} games extracted")
-
-# 2. Raw_NRU 데이터 추출
-print("Extracting Raw_NRU...")
-ws = wb['Raw_NRU']
-
-nru_data = {}
-for row in range(4, 28):
-    game_name = ws.cell(row=row, column=2).value
-    if game_name and game_name != '게임명' and not str(game_name).startswith('-'):
-        nru_values = []
-        for col in range(3, 370):  # D+1 ~ D+365
-            val = ws.cell(row=row, column=col).value
-            if val is not None and isinstance(val, (int, float)):
-                nru_values.append(int(val))
-            else:
-                nru_values.append(0)
-        # 끝의 0 제거
-        while nru_values and nru_values[-1] == 0:
-            nru_values.pop()
-        if nru_values:
-            nru_data[game_name] = nru_values
-
-print(f"  - {len(nru_data)} games extracted")
+parser = argparse.ArgumentParser(description="Raw 시트 데이터를 raw_game_data.json으로 추출")
+parser.add_argument('--pretty', action='store_true', help="JSON을 들여쓰기(2칸)해서 저장 (디버깅용)")
+parser.add_argument('--npz', action='store_true', help="수치 분석용 NumPy 배열(.npz)도 함께 저장")
+parser.add_argument('--sqlite', action='store_true', help="지표별 (game, day, value) 테이블로 SQLite DB도 함께 저장")
+args = parser.parse_args()
+
+# 게임 데이터가 들어 있는 범위 (1부터 시작하는 엑셀 행/열 번호, 4개 시트 중 최대)
+LAST_ROW = 27   # 게임 데이터 마지막 행
+LAST_COL = 369  # D+365 열
+
+# 시트 파서 버전 - read_sheet의 파싱 결과가 달라지는 수정을 하면 올려서 기존 캐시를 무효화
+SHEET_PARSER_VERSION = 1
+
+# SpreadsheetML 네임스페이스
+XL_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+REL_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+PKG_REL_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+def sheet_paths(zf):
+    """시트명 → 워크시트 XML 경로 (xl/workbook.xml + 관계 파일로 매핑)"""
+    rels = ET.fromstring(zf.read('xl/_rels/workbook.xml.rels'))
+    targets = {rel.get('Id'): rel.get('Target') for rel in rels.iter(f'{PKG_REL_NS}Relationship')}
+    paths = {}
+    for sheet in ET.fromstring(zf.read('xl/workbook.xml')).iter(f'{XL_NS}sheet'):
+        target = targets[sheet.get(f'{REL_NS}id')]
+        paths[sheet.get('name')] = target.lstrip('/') if target.startswith('/') else posixpath.join('xl', target)
+    return paths
+
+def shared_strings(zf):
+    """공유 문자열 테이블을 리스트로 한 번만 로드 (서식 있는 텍스트는 조각을 이어 붙임, 윗주 제외)"""
+    if 'xl/sharedStrings.xml' not in zf.namelist():
+        return []
+    strings = []
+    for _, elem in ET.iterparse(zf.open('xl/sharedStrings.xml')):
+        if elem.tag == f'{XL_NS}si':
+            parts = elem.findall(f'{XL_NS}t') + elem.findall(f'{XL_NS}r/{XL_NS}t')
+            strings.append(''.join(t.text or '' for t in parts))
+            elem.clear()
+    return strings
+
+def column_index(ref):
+    """셀 참조('B4')의 열 인덱스 (0부터 시작)"""
+    col = 0
+    for ch in ref:
+        if ch.isdigit():
+            break
+        col = col * 26 + ord(ch) - 64
+    return col - 1
+
+def cell_value(cell, strings):
+    """<c> 요소의 값 (수식 셀은 저장된 결과값, 값이 없으면 None)"""
+    cell_type = cell.get('t', 'n')
+    if cell_type == 'inlineStr':
+        return ''.join(t.text or '' for t in cell.iter(f'{XL_NS}t'))
+    v = cell.find(f'{XL_NS}v')
+    if v is None or v.text is None:
+        return None
+    text = v.text
+    if cell_type == 'n':
+        return float(text) if any(ch in text for ch in '.eE') else int(text)
+    if cell_type == 's':
+        return strings[int(text)]
+    if cell_type == 'b':
+        return text == '1'
+    return text  # str(수식 문자열 결과), e(오류 값), d(ISO 날짜)
+
+def read_sheet(zf, path, strings):
+    """
+    워크시트 XML을 스트리밍 파싱해 LAST_ROW × LAST_COL 범위만 DataFrame으로 반환
+    (인덱스는 엑셀 행/열 위치 그대로 0부터 시작: 1행 = 0, B열 = 1)
+    
+    처리한 요소는 바로 비워 메모리에 DOM을 쌓지 않고, 범위 아래 행에 도달하면 파싱을 중단
+    """
+    values = np.full((LAST_ROW, LAST_COL), None, dtype=object)
+    row_idx, col_idx = -1, -1
+    with zf.open(path) as f:
+        for event, elem in ET.iterparse(f, events=('start', 'end')):
+            if elem.tag == f'{XL_NS}row':
+                if event == 'start':
+                    row_idx = int(elem.get('r')) - 1 if elem.get('r') else row_idx + 1
+                    col_idx = -1
+                    if row_idx >= LAST_ROW:
+                        break
+                else:
+                    elem.clear()
+            elif elem.tag == f'{XL_NS}c' and event == 'end':
+                ref = elem.get('r')
+                col_idx = column_index(ref) if ref else col_idx + 1
+                if col_idx < LAST_COL:
+                    values[row_idx, col_idx] = cell_value(elem, strings)
+                elem.clear()
+    return pd.DataFrame(values)
+
+# 4개 Raw 시트만 xlsm(zip) 안의 시트 XML에서 직접 읽음 (openpyxl 워크북/스타일 객체 생성 없음)
+# 시트끼리는 독립적이므로 스레드로 동시에 압축 해제/파싱 (공유 문자열 테이블은 읽기 전용으로 공유)
+# xlsm은 한 번만 열고 스레드끼리 같은 ZipFile을 공유 (멤버별 읽기 위치는 ZipFile이 잠금으로 관리)
+SHEET_NAMES = ['Raw_Retention', 'Raw_NRU', 'Raw_PR', 'Raw_ARPPU']
+
+# 파싱한 시트는 원본 파일 mtime을 키로 출력 폴더에 캐시 → 같은 파일로 다시 실행하면 xlsm 파싱 생략
+# 캐시된 시트는 LAST_ROW × LAST_COL 범위로 잘려 있으므로 범위와 파서 버전도 키에 포함
+cache_prefix = Path(file_path).stem
+cache_key = f'{os.stat(file_path).st_mtime_ns}.r{LAST_ROW}c{LAST_COL}.v{SHEET_PARSER_VERSION}'
+cache_path = output_path.parent / f'{cache_prefix}.{cache_key}.sheets.pkl'
+if cache_path.exists():
+    print("Loading cached sheets...")
+    with open(cache_path, 'rb') as f:
+        sheets = pickle.load(f)
+else:
+    print("Loading workbook...")
+    with zipfile.ZipFile(file_path) as zf, ThreadPoolExecutor(max_workers=len(SHEET_NAMES)) as executor:
+        paths = sheet_paths(zf)
+        strings = shared_strings(zf)
+        futures = {name: executor.submit(read_sheet, zf, paths[name], strings) for name in SHEET_NAMES}
+        sheets = {name: future.result() for name, future in futures.items()}
+    
+    # 이전 버전 파일의 캐시는 삭제
+    for stale_path in output_path.parent.glob(f'{cache_prefix}.*.sheets.pkl'):
+        stale_path.unlink()
+    with open(cache_path, 'wb') as f:
+        pickle.dump(sheets, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+# B열에서 게임명이 아닌 고정 문구 (헤더 행)
+NON_GAME_NAMES = frozenset(['게임명'])
+
+def is_game_name(name):
+    """게임 행 여부 - 비어 있거나 헤더/안내 문구('-'로 시작)인 행 제외"""
+    if isinstance(name, str):
+        return bool(name) and name not in NON_GAME_NAMES and not name.startswith('-')
+    # 숫자 게임명 (음수는 '-'로 시작하므로 제외)
+    return bool(name) and not pd.isna(name) and not str(name).startswith('-')
+
+def game_block(df, last_row, last_col):
+    """
+    게임 행만 골라 (게임명 리스트, 일별 값 float64 배열) 반환
+    - 4행 ~ last_row행, B열 게임명 + C열 ~ last_col열 일별 값
+    - 게임명이 비었거나 헤더('게임명')/안내 문구('-'로 시작)인 행 제외
+    - 숫자로 변환할 수 없는 셀(빈 칸, 문자열 등)은 NaN (숫자 형태의 텍스트 셀은 숫자로 인식)
+    """
+    # 시트가 범위보다 작으면 빈 셀(NaN)로 채움
+    df = df.reindex(index=range(last_row), columns=range(last_col))
+    names = df.iloc[3:, 1]
+    keep = names.map(is_game_name).astype(bool)
+    block = df.iloc[3:, 2:][keep]
+    # 셀 값 전체를 한 번에 숫자로 변환 (변환할 수 없는 셀은 NaN)
+    values = pd.to_numeric(block.to_numpy(dtype=object).ravel(), errors='coerce')
+    return names[keep].tolist(), np.asarray(values, dtype=np.float64).reshape(block.shape)
+
+def extract_games(sheet_name, last_row, last_col, trim_mode, cast=float, decimals=6):
+    """
+    Raw 시트 하나에서 {게임명: 일별 값 리스트} 추출
+    
+    trim_mode:
+        'retention': 처음으로 숫자가 아니거나 1 이상인 셀 앞까지만 사용 (리텐션은 1 미만)
+        'trailing_zero': 숫자가 아닌 셀은 0으로 채우고 끝의 0 제거
+    cast: int면 정수로 변환(소수점 버림), float면 decimals 자리로 반올림
+    """
+    print(f"Extracting {sheet_name}...")
+    # 시트 전체를 (게임 수 × 일수) 배열 하나로 변환/반올림한 뒤, 게임별로 남길 길이만 계산
+    names, values = game_block(sheets[sheet_name], last_row, last_col)
+    if trim_mode == 'retention':
+        # 첫 번째 무효 셀(NaN 포함 1 이상) 위치에서 자름
+        valid = values < 1
+        lengths = np.where(valid.all(axis=1), valid.shape[1], valid.argmin(axis=1))
+    else:
+        values = np.nan_to_num(values, nan=0)
+    
+    if cast is int:
+        values = values.astype(np.int64)
+    else:
+        values = np.round(values, decimals)  # 시트 전체를 한 번에 반올림
+    
+    # 끝의 0 제거 (정수 변환/반올림 후 0이 된 값 포함) - 마지막으로 0이 아닌 값 다음 위치까지 사용
+    if trim_mode == 'trailing_zero':
+        nonzero = values != 0
+        lengths = np.where(nonzero.any(axis=1), nonzero.shape[1] - nonzero[:, ::-1].argmax(axis=1), 0)
+    
+    data = {name: row[:n].tolist() for name, row, n in zip(names, values, lengths) if n}
+    
+    print(f"  - {len(data)} games extracted")
+    return data
+
+def pack_games(data, dtype):
+    """
+    {게임명: 일별 값 리스트} → (게임명 배열, 게임별 길이 배열, 2차원 값 배열)
+    게임마다 길이가 달라 가장 긴 게임에 맞춰 채움 (정수는 0, 실수는 NaN)
+    """
+    lengths = np.array([len(values) for values in data.values()], dtype=np.int64)
+    fill = 0 if np.issubdtype(dtype, np.integer) else np.nan
+    packed = np.full((len(data), lengths.max(initial=0)), fill, dtype=dtype)
+    for i, values in enumerate(data.values()):
+        packed[i, :len(values)] = values
+    return np.array([str(name) for name in data], dtype=str), lengths, packed
+
+# 1. Raw_Retention 데이터 추출 (D+1 ~ D+90)
+retention_data = extract_games('Raw_Retention', 26, 94, 'retention')
+
+# 2. Raw_NRU 데이터 추출 (D+1 ~ D+365)
+nru_data = extract_games('Raw_NRU', 27, 369, 'trailing_zero', cast=int)
 
 # 3. Raw_PR (Payment Rate) 데이터 추출
-print("Extracting Raw_PR...")
-ws = wb['Raw_PR']
-
-pr_data = {}
-for row in range(4, 28):
-    game_name = ws.cell(row=row, column=2).value
-    if game_name and game_name != '게임명' and not str(game_name).startswith('-'):
-        pr_values = []
-        for col in range(3, 370):
-            val = ws.cell(row=row, column=col).value
-            if val is not None and isinstance(val, (int, float)):
-                pr_values.append(round(float(val), 6))
-            else:
-                pr_values.append(0)
-        while pr_values and pr_values[-1] == 0:
-            pr_values.pop()
-        if pr_values:
-            pr_data[game_name] = pr_values
-
-print(f"  - {len(pr_data)} games extracted")
+pr_data = extract_games('Raw_PR', 27, 369, 'trailing_zero')
 
 # 4. Raw_ARPPU 데이터 추출
-print("Extracting Raw_ARPPU...")
-ws = wb['Raw_ARPPU']
-
-arppu_data = {}
-for row in range(4, 28):
-    game_name = ws.cell(row=row, column=2).value
-    if game_name and game_name != '게임명' and not str(game_name).startswith('-'):
-        arppu_values = []
-        for col in range(3, 370):
-            val = ws.cell(row=row, column=col).value
-            if val is not None and isinstance(val, (int, float)):
-                arppu_values.append(round(float(val), 2))
-            else:
-                arppu_values.append(0)
-        while arppu_values and arppu_values[-1] == 0:
-            arppu_values.pop()
-        if arppu_values:
-            arppu_data[game_name] = arppu_values
-
-print(f"  - {len(arppu_data)} games extracted")
-
-wb.close()
+arppu_data = extract_games('Raw_ARPPU', 27, 369, 'trailing_zero', decimals=2)
 
 # JSON 스키마로 통합
 raw_data = {
@@ -114,11 +238,47 @@ raw_data = {
     }
 }
 
-# JSON 파일로 저장
-with open('/home/claude/game-kpi-projection/data/raw_game_data.json', 'w', encoding='utf-8') as f:
-    json.dump(raw_data, f, ensure_ascii=False, indent=2)
+# JSON 파일로 저장 (orjson: UTF-8 바이트로 바로 직렬화, 숫자 게임명 키는 문자열로 변환)
+# 기본은 공백 없는 compact 출력, --pretty일 때만 들여쓰기
+json_options = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if args.pretty else 0)
+with open(output_path, 'wb') as f:
+    f.write(orjson.dumps(raw_data, option=json_options))
 
 print("\n✅ JSON export completed: data/raw_game_data.json")
+
+# --npz: 같은 데이터를 지표별 2차원 배열로 저장 (JSON 파싱 없이 np.load로 바로 사용)
+# 백엔드 업로드는 JSON만 갱신하므로 앱의 원본 데이터는 JSON, npz는 추출 시점의 스냅샷
+if args.npz:
+    arrays = {}
+    for key, dtype in [('retention', np.float64), ('nru', np.int64), ('payment_rate', np.float64), ('arppu', np.float64)]:
+        names, lengths, packed = pack_games(raw_data['games'][key], dtype)
+        arrays[key] = packed
+        arrays[f'{key}_names'] = names
+        arrays[f'{key}_lengths'] = lengths
+    np.savez_compressed(output_path.with_suffix('.npz'), **arrays)
+    print("✅ NPZ export completed: data/raw_game_data.npz")
+
+# --sqlite: 지표별 long 포맷 테이블 (game, day, value) - (game, day) 기본 키로 게임별 조회
+# npz와 마찬가지로 추출 시점의 스냅샷이며, 실행할 때마다 새로 생성
+if args.sqlite:
+    db_path = output_path.with_suffix('.sqlite')
+    db_path.unlink(missing_ok=True)
+    with closing(sqlite3.connect(db_path)) as conn, conn:
+        for key, value_type in [('retention', 'REAL'), ('nru', 'INTEGER'), ('payment_rate', 'REAL'), ('arppu', 'REAL')]:
+            conn.execute(
+                f'CREATE TABLE {key} (game TEXT NOT NULL, day INTEGER NOT NULL, value {value_type} NOT NULL, '
+                'PRIMARY KEY (game, day)) WITHOUT ROWID'
+            )
+            conn.executemany(
+                f'INSERT INTO {key} VALUES (?, ?, ?)',
+                (
+                    (str(game_name), day, value)
+                    for game_name, values in raw_data['games'][key].items()
+                    for day, value in enumerate(values, start=1)  # D+1 = 1
+                ),
+            )
+    print("✅ SQLite export completed: data/raw_game_data.sqlite")
+
 print(f"\nSummary:")
 print(f"  - Retention: {len(retention_data)} games")
 print(f"  - NRU: {len(nru_data)} games")